@@ -2,43 +2,116 @@
 
 from __future__ import annotations
 
+from functools import partial
 import logging
 
-from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import BshTidesCoordinator
+from .bsh_api import async_close_session, async_get_session
+from .const import DATA_REGISTRY, DATA_SCHEDULER, DOMAIN
+from .coordinator import STORAGE_VERSION, BshTidesCoordinator
+from .registry import async_get_registry
+from .scheduler import async_get_scheduler
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 # BSH Api Response gets put into a sensor
-_PLATFORMS: list[Platform] = [Platform.SENSOR]
+_PLATFORMS: list[Platform] = [Platform.CALENDAR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of BSH Tides for Germany, they serve all configured stations."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up BSH Tides for Germany from a config entry."""
 
     bshnr = entry.data["bshnr"]
-    coordinator = BshTidesCoordinator(hass, bshnr)
-
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.warning("Initial data fetch failed: %s", err)
-        raise ConfigEntryNotReady(f"BSH Tides update failed: {err}") from err
+    registry = async_get_registry(hass)
+    # Entries of the same station share its coordinator
+    coordinator = await registry.async_acquire(
+        bshnr, partial(_async_create_coordinator, hass, entry)
+    )
+    if dict(entry.options) != coordinator.options:
+        _LOGGER.warning(
+            "Station %s is configured more than once, the options of %s are ignored"
+            " in favour of those of the entry set up first",
+            bshnr,
+            entry.title,
+        )
 
     # Register coordinator in hass.data[DOMAIN][entry.entry_id]
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entry.async_on_unload(partial(registry.async_release, bshnr))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
     return True
 
 
+async def _async_create_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> BshTidesCoordinator:
+    """Create the coordinator of a station and load its forecast."""
+    bshnr = entry.data["bshnr"]
+    scheduler = async_get_scheduler(hass)
+    coordinator = BshTidesCoordinator(
+        hass,
+        bshnr,
+        async_get_session(hass),
+        scheduler,
+        entry.options,
+        _async_get_store(hass, bshnr),
+    )
+
+    # Serves the cached forecast if there is one, raises ConfigEntryNotReady if the forecast cannot be loaded
+    await coordinator.async_first_refresh()
+
+    # Removed from the scheduler again in coordinator.async_shutdown
+    scheduler.async_add(coordinator)
+    return coordinator
+
+
+def _async_get_store(hass: HomeAssistant, bshnr: str) -> Store:
+    """Return the on-disk cache of the last parsed forecast of a station."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{bshnr}")
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        # The pooled session, scheduler and registry are shared by all entries, so only drop them with the last one
+        if not hass.data[DOMAIN]:
+            hass.data.pop(DATA_SCHEDULER, None)
+            hass.data.pop(DATA_REGISTRY, None)
+            await async_close_session(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached forecast of a deleted config entry, unless another entry uses the same station."""
+    bshnr = entry.data["bshnr"]
+    if any(
+        other.data["bshnr"] == bshnr
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        return
+    await _async_get_store(hass, bshnr).async_remove()
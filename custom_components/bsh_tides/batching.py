@@ -0,0 +1,89 @@
+"""Batched executor jobs of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Jobs smaller than this (e.g. the number of forecast items of a payload) run inline on the event loop,
+# where they are faster than the hand-off to the executor
+INLINE_THRESHOLD = 200
+# Jobs submitted within this time are run in the same executor job
+BATCH_DELAY = 0.05  # seconds
+
+
+def _run_batch(jobs: list[Callable[[], Any]]) -> list[tuple[Any, Exception | None]]:
+    """Run the jobs one after another, returning the result or the error of every job."""
+    results: list[tuple[Any, Exception | None]] = []
+    for job in jobs:
+        try:
+            results.append((job(), None))
+        except Exception as err:  # noqa: BLE001 - handed to the caller of the job
+            results.append((None, err))
+    return results
+
+
+class BshJobBatcher:
+    """Runs CPU bound jobs, e.g. parsing the forecasts of the stations, in the executor.
+
+    Stations often refresh together, e.g. at startup or when BSH publishes new forecasts. Their jobs are
+    collected for BATCH_DELAY and run in a single executor job, instead of one hand-off per station.
+    Small jobs below the inline threshold are not worth the hand-off and run right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        inline_threshold: int = INLINE_THRESHOLD,
+        delay: float = BATCH_DELAY,
+    ):
+        self.hass = hass
+        self.inline_threshold = inline_threshold
+        self._delay = delay
+        self._pending: list[tuple[Callable[[], Any], asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def async_run(self, job: Callable[[], _T], size: int) -> _T:
+        """Return the result of the job, run in the next batch unless its size is below the inline threshold."""
+        if size < self.inline_threshold:
+            return job()
+        future: asyncio.Future[_T] = self.hass.loop.create_future()
+        self._pending.append((job, future))
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(self._delay, self._async_flush)
+        return await future
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        self.hass.async_create_background_task(
+            self._async_run_batch(batch), "BSH Tides job batch"
+        )
+
+    async def _async_run_batch(
+        self, batch: list[tuple[Callable[[], Any], asyncio.Future]]
+    ) -> None:
+        _LOGGER.debug("Running a batch of %s jobs in the executor", len(batch))
+        try:
+            results = await self.hass.async_add_executor_job(
+                _run_batch, [job for job, _ in batch]
+            )
+        except Exception as err:  # noqa: BLE001 - e.g. the executor is shut down
+            results = [(None, err)] * len(batch)
+        for (_, future), (result, error) in zip(batch, results):
+            if future.done():
+                # the caller was cancelled meanwhile
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,121 @@
+"""Circuit breaker for the BSH host."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import random
+import time
+
+from .exceptions import BshCannotConnect, BshCircuitOpen
+
+_LOGGER = logging.getLogger(__name__)
+
+# Failed requests in a row (of any station) after which the host is considered down
+FAILURE_THRESHOLD = 3
+# Time until the first probe, doubled after every failed probe
+BASE_BACKOFF = 30.0  # seconds
+MAX_BACKOFF = 1800.0  # seconds
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BshCircuitBreaker:
+    """Stops requests to the BSH host while it is down.
+
+    After FAILURE_THRESHOLD connection errors in a row the circuit opens and all requests fail right away with
+    BshCircuitOpen. Once the backoff has passed, a single request is let through as probe (half-open): if it
+    succeeds the circuit closes again, otherwise it opens with a doubled backoff. The backoff is randomized
+    between half and the full value, so restarted instances do not probe in lockstep.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ):
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self.state = CLOSED
+        self._failures = 0
+        # Number of times the circuit opened in a row, for the exponential backoff
+        self._trips = 0
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is let through, 0 if the circuit is closed."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Guard a request to the host.
+
+        Raises BshCircuitOpen instead of running the request while the circuit is open. A BshCannotConnect
+        of the request counts as failure. Any other outcome means the host answered and counts as success,
+        except for a cancelled request which leaves no verdict.
+        """
+        self._before_request()
+        try:
+            yield
+        except BshCannotConnect:
+            self._record_failure()
+            raise
+        except Exception:
+            self._record_success()
+            raise
+        except BaseException:
+            self._probing = False
+            raise
+        self._record_success()
+
+    def _before_request(self) -> None:
+        if self.state == CLOSED:
+            return
+        if self._probing or time.monotonic() < self._retry_at:
+            raise BshCircuitOpen(
+                f"BSH API is unavailable, retrying in {self.retry_in:.0f} s"
+            )
+        self.state = HALF_OPEN
+        self._probing = True
+        _LOGGER.debug("Probing BSH API")
+
+    def _record_success(self) -> None:
+        if self.state != CLOSED:
+            _LOGGER.info("BSH API is available again")
+        self.state = CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._probing = False
+
+    def _record_failure(self) -> None:
+        self._probing = False
+        if self.state == OPEN:
+            # a request which was already running when the circuit opened
+            return
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self._failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        backoff = min(self._base_backoff * 2**self._trips, self._max_backoff)
+        backoff *= random.uniform(0.5, 1.0)
+        self._trips += 1
+        self._retry_at = time.monotonic() + backoff
+        if self.state == CLOSED:
+            _LOGGER.warning(
+                "BSH API failed %s times in a row, pausing requests for %.0f s",
+                self._failures,
+                backoff,
+            )
+        else:
+            _LOGGER.debug("BSH API still unavailable, next probe in %.0f s", backoff)
+        self.state = OPEN
@@ -1,10 +1,85 @@
-import aiohttp
+import asyncio
+from contextlib import asynccontextmanager
+import hashlib
+from http import HTTPStatus
 import logging
+import time
+
+import aiohttp
 
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DATA_SESSION
+from .breaker import BshCircuitBreaker
+from .decoding import (
+    HashingReader,
+    async_decode_station_stream,
+    json_loads,
+    missing_keys,
+    streaming_available,
+)
 from .exceptions import BshApiError, BshCannotConnect, BshInvalidStation
+from .telemetry import StationTelemetry, elapsed_ms
 
 _LOGGER = logging.getLogger(__name__)
 
+# All stations are served by the same host, so a handful of kept-alive connections is plenty
+MAX_CONNECTIONS_PER_HOST = 4
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 120  # seconds
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Station requests in flight, keyed by URL and validators. Identical requests join the one in flight.
+_IN_FLIGHT: dict[tuple[str, str | None, str | None, str | None], asyncio.Task] = {}
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the pooled session shared by all BSH Tides entries, creating it on first use.
+
+    The session keeps connections to the BSH host alive between refreshes, caches DNS lookups
+    and limits the number of parallel connections per host.
+    """
+    session: aiohttp.ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    session = aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+    hass.data[DATA_SESSION] = session
+
+    @callback
+    def _async_close_on_stop(event: Event) -> None:
+        if not session.closed:
+            hass.async_create_task(session.close())
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_on_stop)
+    _LOGGER.debug("Created pooled BSH client session")
+    return session
+
+
+async def async_close_session(hass: HomeAssistant) -> None:
+    """Close the shared session, e.g. after the last config entry was unloaded."""
+    session: aiohttp.ClientSession | None = hass.data.pop(DATA_SESSION, None)
+    if session is not None and not session.closed:
+        await session.close()
+        _LOGGER.debug("Closed pooled BSH client session")
+
+
+@asynccontextmanager
+async def _async_session(session: aiohttp.ClientSession | None):
+    """Use the given shared session, or fall back to a short-lived one."""
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as own_session:
+        yield own_session
+
 
 class BshApi:
     """Class for interacting with the BSH Tides API."""
@@ -12,43 +87,155 @@ class BshApi:
     # Contains the list of available stations
     MAP_URL = "https://wasserstand-nordsee.bsh.de/data/map.json"
 
-    def __init__(self, bshnr: str):
+    def __init__(
+        self,
+        bshnr: str,
+        session: aiohttp.ClientSession | None = None,
+        streaming: bool = False,
+        telemetry: StationTelemetry | None = None,
+        breaker: BshCircuitBreaker | None = None,
+    ):
         self.bshnr = bshnr
+        # Latency, size and decode time of the responses are recorded here if given
+        self.telemetry = telemetry
+        # Shared by all stations, skips requests while the BSH host is down
+        self._breaker = breaker
         self.api_url = f"https://wasserstand-nordsee.bsh.de/data/DE__{bshnr}.json"
+        self._session = session
+        # Decode the payload while it is read, see decoding.async_decode_station_stream
+        self._streaming = streaming and streaming_available()
+        if streaming and not self._streaming:
+            _LOGGER.warning(
+                "Streaming decode requested for station %s, but ijson is not installed",
+                bshnr,
+            )
+        # Validators of the last successful response, used for conditional requests
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._content_hash: str | None = None
+
+    def reset_validators(self) -> None:
+        """Forget the validators so the next request fetches the full payload again."""
+        self._etag = None
+        self._last_modified = None
+        self._content_hash = None
 
-    async def async_fetch_data(self):
-        """Fetch tide data for a given station."""
+    async def async_fetch_data(self, conditional: bool = False) -> dict | None:
+        """Fetch tide data for a given station.
+
+        With conditional=True, the validators (ETag / Last-Modified) of the previous response are sent along.
+        If the server answers with 304 Not Modified or the body did not change, None is returned.
+        In streaming mode, only the used parts of the payload are decoded and the curve forecast is
+        returned as columns, see decoding.async_decode_station_stream.
+        With a circuit breaker, BshCircuitOpen is raised without a request while the BSH host is down.
+
+        Identical requests for the same station (same URL and validators) are coalesced: while one is in
+        flight, the others wait for its result instead of sending their own.
+        """
+        if conditional:
+            key = (self.api_url, self._etag, self._last_modified, self._content_hash)
+        else:
+            key = (self.api_url, None, None, None)
+        if (task := _IN_FLIGHT.get(key)) is not None:
+            _LOGGER.debug("Joining request in flight for station %s", self.bshnr)
+        else:
+            task = _IN_FLIGHT[key] = asyncio.create_task(
+                self._async_guarded_fetch_data(conditional)
+            )
+            task.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+        # a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _async_guarded_fetch_data(self, conditional: bool) -> dict | None:
+        if self._breaker is None:
+            return await self._async_fetch_data(conditional)
+        with self._breaker.guard():
+            return await self._async_fetch_data(conditional)
+
+    async def _async_fetch_data(self, conditional: bool) -> dict | None:
+        headers = {}
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        telemetry = self.telemetry
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.api_url, ssl=False) as response:
+            async with _async_session(self._session) as session:
+                started = time.perf_counter()
+                async with session.get(
+                    self.api_url, headers=headers, ssl=False
+                ) as response:
+                    if telemetry:
+                        telemetry.fetch_latency.add(elapsed_ms(started))
+                    if response.status == HTTPStatus.NOT_MODIFIED:
+                        _LOGGER.debug("Station %s not modified (304)", self.bshnr)
+                        return None
                     response.raise_for_status()
-                    data = await response.json()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    decode_started = time.perf_counter()
+                    if self._streaming:
+                        reader = HashingReader(response.content)
+                        data = await async_decode_station_stream(reader)
+                        content_hash = reader.hexdigest()
+                        size = reader.size
+                    else:
+                        body = await response.read()
+                        content_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+                        size = len(body)
+                    if telemetry:
+                        telemetry.payload_size.add(size)
+                    if conditional and content_hash == self._content_hash:
+                        _LOGGER.debug("Station %s payload unchanged", self.bshnr)
+                        self._etag, self._last_modified = etag, last_modified
+                        return None
+                    if not self._streaming:
+                        if missing_keys(body, ("station_name",)):
+                            raise BshInvalidStation(
+                                f"Invalid station data of {self.bshnr}: no station_name"
+                            )
+                        data = json_loads(body)
+                    if telemetry:
+                        telemetry.decode_time.add(elapsed_ms(decode_started))
                     if "station_name" not in data or "gauges" in data:
                         raise BshInvalidStation(f"Invalid station data: {data}")
+                    self._etag, self._last_modified = etag, last_modified
+                    self._content_hash = content_hash
                     return data
-        except aiohttp.ClientError as e:
-            _LOGGER.debug("aiohttp.ClientError: %s", e)
+        except aiohttp.ClientResponseError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                raise BshInvalidStation(f"Station {self.bshnr} not found") from e
+            _LOGGER.debug("aiohttp.ClientResponseError: %s", e)
+            raise BshCannotConnect(f"BSH API responded with {e.status}") from e
+        except (aiohttp.ClientError, TimeoutError) as e:
+            _LOGGER.debug("%s: %s", type(e).__name__, e)
             raise BshCannotConnect("Could not connect to BSH API") from e
         except ValueError as e:
             _LOGGER.debug("Invalid JSON in station data: %s", e)
             raise BshApiError("Invalid JSON in response") from e
 
     @staticmethod
-    async def fetch_station_list() -> list[tuple[str, str, str]]:
+    async def fetch_station_list(
+        session: aiohttp.ClientSession | None = None,
+    ) -> list[tuple[str, str, str]]:
         """Fetch all available stations with (bshnr, station_name, area) for config_flow."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _async_session(session) as session:
                 async with session.get(BshApi.MAP_URL, ssl=False) as response:
                     response.raise_for_status()
-                    data = await response.json()
+                    body = await response.read()
+                    if missing_keys(body, ("gauges",)):
+                        raise BshInvalidStation("Missing 'gauges' in station list")
+                    data = json_loads(body)
                     if "gauges" not in data:
                         raise BshInvalidStation("Missing 'gauges' in station list")
                     return [
                         (entry["bshnr"], entry["station_name"], entry["area"])
                         for entry in data["gauges"]
                     ]
-        except aiohttp.ClientError as e:
-            _LOGGER.debug("aiohttp.ClientError while fetching station list: %s", e)
+        except (aiohttp.ClientError, TimeoutError) as e:
+            _LOGGER.debug("%s while fetching station list: %s", type(e).__name__, e)
             raise BshCannotConnect("Could not connect to BSH station list API") from e
         except (ValueError, KeyError) as e:
             _LOGGER.debug("Invalid station list data: %s", e)
@@ -0,0 +1,78 @@
+"""Learns the publication cadence of BSH forecasts to adapt the refresh interval."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import UTC, datetime, timedelta
+
+# Number of forecast publications we remember per station
+HISTORY_SIZE = 28
+# Publications closer than this (time of day) are considered the same daily slot
+SLOT_TOLERANCE = timedelta(minutes=30)
+# Start polling tightly this long before an expected publication ...
+PUBLICATION_LEAD = timedelta(minutes=10)
+# ... and keep polling tightly for this long after it, before we assume it was skipped
+PUBLICATION_WINDOW = timedelta(minutes=60)
+
+
+class PublicationCadence:
+    """Tracks when forecasts were created and predicts when the next one is due.
+
+    BSH publishes new forecasts at roughly the same times every day. From the history of creation_forecast
+    timestamps we derive these daily slots. Around an expected publication we poll with the lower bound,
+    in between we back off up to the upper bound.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._history: deque[datetime] = deque(maxlen=HISTORY_SIZE)
+
+    @property
+    def history(self) -> list[datetime]:
+        """The remembered publication times, oldest first."""
+        return list(self._history)
+
+    def add(self, created: datetime) -> None:
+        """Remember the creation time of a forecast, duplicates are ignored."""
+        created = created.astimezone(UTC)
+        if created not in self._history:
+            self._history.append(created)
+
+    @property
+    def slots(self) -> list[timedelta]:
+        """Expected publication times as offsets from midnight UTC, sorted."""
+        times = sorted(
+            timedelta(hours=ts.hour, minutes=ts.minute, seconds=ts.second)
+            for ts in self._history
+        )
+        slots: list[timedelta] = []
+        for time_of_day in times:
+            # keep the earliest time of each cluster so we start polling early enough
+            if not slots or time_of_day - slots[-1] > SLOT_TOLERANCE:
+                slots.append(time_of_day)
+        return slots
+
+    def next_publication(self, now: datetime) -> datetime | None:
+        """Return the next expected publication we have not seen yet."""
+        slots = self.slots
+        if not slots:
+            return None
+        # Slots we have already seen, or which passed without a publication, are skipped
+        after = max(self._history[-1] + SLOT_TOLERANCE, now - PUBLICATION_WINDOW)
+        midnight = after.replace(hour=0, minute=0, second=0, microsecond=0)
+        for day in range(2):
+            for slot in slots:
+                expected = midnight + timedelta(days=day) + slot
+                if expected > after:
+                    return expected
+        return None
+
+    def next_interval(self, now: datetime) -> timedelta:
+        """Return how long to wait before the next refresh."""
+        expected = self.next_publication(now)
+        if expected is None:
+            # nothing learned yet, poll with the upper bound
+            return self.max_interval
+        wait = expected - PUBLICATION_LEAD - now
+        return min(max(wait, self.min_interval), self.max_interval)
@@ -0,0 +1,80 @@
+"""Calendar platform for BSH Tides for Germany."""
+
+from datetime import UTC, datetime
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, TideEvent
+from .coordinator import BshTidesCoordinator
+from .entity import BshEntity
+from .forecast import ForecastEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_SUMMARIES = {
+    TideEvent.HIGH.value: "High tide",
+    TideEvent.LOW.value: "Low tide",
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    coordinator: BshTidesCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([BshTidesCalendar(coordinator)])
+
+
+class BshTidesCalendar(BshEntity, CalendarEntity):
+    """All high and low tides of the forecast of a station as calendar events.
+
+    Range queries of the calendar view are bisects over the sorted index of the coordinator,
+    which is rebuilt once per parsed forecast.
+    """
+
+    _attr_icon = "mdi:calendar-clock"
+    _attr_translation_key = "tides"
+
+    @property
+    def available(self) -> bool:
+        # stays available while the refreshes fail, as long as the forecast has upcoming tides
+        return self.coordinator.index.next_event(datetime.now(UTC)) is not None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next high or low tide."""
+        item = self.coordinator.index.next_event(datetime.now(UTC))
+        return self._calendar_event(item) if item else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the high and low tides from start_date to end_date."""
+        items = self.coordinator.index.between(start_date, end_date)
+        _LOGGER.debug(
+            "%s: %s tides from %s to %s", self.unique_id, len(items), start_date, end_date
+        )
+        return [self._calendar_event(item) for item in items]
+
+    def _calendar_event(self, item: ForecastEvent) -> CalendarEvent:
+        summary = EVENT_SUMMARIES.get(item.event, item.event or "Tide")
+        details = []
+        if item.level is not None:
+            details.append(f"{item.level} cm")
+        if item.forecast is not None:
+            details.append(f"{item.forecast:+d} cm from mean")
+        if item.predicted:
+            details.append("predicted")
+        return CalendarEvent(
+            start=item.time,
+            end=item.time,
+            summary=summary,
+            description=", ".join(details) or None,
+            location=self.coordinator.station_name,
+            uid=f"{self.coordinator.bshnr}_{int(item.time.timestamp())}",
+        )
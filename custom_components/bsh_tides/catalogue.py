@@ -0,0 +1,139 @@
+"""Cached station catalogue of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .bsh_api import BshApi, async_get_session
+from .const import DATA_CATALOGUE, DOMAIN
+from .exceptions import BshApiError
+
+_LOGGER = logging.getLogger(__name__)
+
+# The station list rarely changes, so it is fetched at most once per TTL
+CATALOGUE_TTL = timedelta(hours=24)
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.stations"
+STORAGE_SAVE_DELAY = 1  # seconds
+
+
+@callback
+def async_get_catalogue_cache(hass: HomeAssistant) -> StationCatalogueCache:
+    """Return the station catalogue cache shared by all config flows, creating it on first use."""
+    cache: StationCatalogueCache | None = hass.data.get(DATA_CATALOGUE)
+    if cache is None:
+        cache = hass.data[DATA_CATALOGUE] = StationCatalogueCache(hass)
+    return cache
+
+
+class StationCatalogue:
+    """All BSH stations, indexed by area and by bshnr.
+
+    The stations of every area are sorted by name once, so the config flow can show them without sorting
+    or filtering the whole list again.
+    """
+
+    def __init__(self, stations: Iterable[tuple[str, str, str]], fetched: datetime):
+        self.fetched = fetched
+        self.names: dict[str, str] = {}
+        self._by_area: dict[str, dict[str, str]] = {}
+        for bshnr, name, area in sorted(stations, key=lambda item: item[1]):
+            self._by_area.setdefault(area, {})[bshnr] = name
+            self.names[bshnr] = name
+        self.areas: list[str] = sorted(self._by_area)
+
+    def stations(self, area: str) -> dict[str, str]:
+        """Return the stations of an area as (bshnr: station_name), sorted by name."""
+        return self._by_area.get(area, {})
+
+    def name(self, bshnr: str) -> str | None:
+        """Return the name of a station, None if the bshnr is unknown."""
+        return self.names.get(bshnr)
+
+    def expired(self, now: datetime, ttl: timedelta = CATALOGUE_TTL) -> bool:
+        """Return True if the catalogue is older than the TTL."""
+        return now - self.fetched >= ttl
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the catalogue as JSON serializable dict for the on-disk cache."""
+        return {
+            "fetched": self.fetched.isoformat(),
+            "stations": [
+                [bshnr, name, area]
+                for area, stations in self._by_area.items()
+                for bshnr, name in stations.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> StationCatalogue:
+        """Create a catalogue from a dict of as_dict()."""
+        return cls(
+            (tuple(item) for item in data["stations"]),
+            datetime.fromisoformat(data["fetched"]),
+        )
+
+
+class StationCatalogueCache:
+    """Keeps the station catalogue in memory and on disk, and refreshes it once the TTL expired.
+
+    If the refresh fails, an outdated catalogue is used rather than failing the config flow.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: Store | None = None,
+        ttl: timedelta = CATALOGUE_TTL,
+    ):
+        self.hass = hass
+        self.ttl = ttl
+        self._store = store or Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._catalogue: StationCatalogue | None = None
+        self._loaded = False
+        # Flows started at the same time share one request
+        self._lock = asyncio.Lock()
+
+    async def async_get(self) -> StationCatalogue:
+        """Return the station catalogue, fetching it from the BSH API if there is no current one."""
+        async with self._lock:
+            if not self._loaded:
+                self._catalogue = await self._async_load()
+                self._loaded = True
+
+            now = datetime.now(UTC)
+            if self._catalogue is not None and not self._catalogue.expired(now, self.ttl):
+                return self._catalogue
+
+            try:
+                stations = await BshApi.fetch_station_list(async_get_session(self.hass))
+            except BshApiError as err:
+                if self._catalogue is None:
+                    raise
+                _LOGGER.warning(
+                    "Could not refresh station list, using the one of %s: %s",
+                    self._catalogue.fetched,
+                    err,
+                )
+                return self._catalogue
+
+            self._catalogue = StationCatalogue(stations, now)
+            self._store.async_delay_save(self._catalogue.as_dict, STORAGE_SAVE_DELAY)
+            _LOGGER.debug("Fetched station catalogue with %s stations", len(self._catalogue.names))
+            return self._catalogue
+
+    async def _async_load(self) -> StationCatalogue | None:
+        if not (data := await self._store.async_load()):
+            return None
+        try:
+            return StationCatalogue.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.debug("Ignoring invalid station catalogue cache")
+            return None
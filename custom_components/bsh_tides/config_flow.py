@@ -7,25 +7,38 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.core import HomeAssistant
-
-from .bsh_api import BshApi
-from .const import DOMAIN
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .catalogue import StationCatalogue, async_get_catalogue_cache
+from .const import (
+    CONF_HARMONIC_PREDICTION,
+    CONF_MAX_REFRESH_INTERVAL,
+    CONF_MIN_REFRESH_INTERVAL,
+    CONF_STREAMING_DECODE,
+    DEFAULT_MAX_REFRESH_INTERVAL,
+    DEFAULT_MIN_REFRESH_INTERVAL,
+    DOMAIN,
+)
+from .decoding import streaming_available
 from .exceptions import BshCannotConnect, BshInvalidStation
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user selected an existing station."""
+    """Validate the user selected an existing station, using the cached station catalogue."""
     _LOGGER.debug("Validating BSH station input: %s", data["bshnr"])
-    api = BshApi(data["bshnr"])
-    forecast_data = await api.async_fetch_data()
-    _LOGGER.debug(
-        "Validation successful for station: %s", forecast_data["station_name"]
-    )
-    return {"bshnr": data["bshnr"], "title": forecast_data["station_name"]}
+    catalogue = await async_get_catalogue_cache(hass).async_get()
+    if (station_name := catalogue.name(data["bshnr"])) is None:
+        raise BshInvalidStation(f"Unknown station {data['bshnr']}")
+    _LOGGER.debug("Validation successful for station: %s", station_name)
+    return {"bshnr": data["bshnr"], "title": station_name}
 
 
 class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -33,6 +46,14 @@ class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    catalogue: StationCatalogue
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return BshTidesOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -45,9 +66,9 @@ class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
             _LOGGER.debug("User selected area: %s", self.area)
             return await self.async_step_station()
 
-        # Fetch the list of available stations from the BSH API
+        # Get the list of available stations, only fetched from the BSH API if the cached one expired
         try:
-            self.station_map = await BshApi.fetch_station_list()
+            self.catalogue = await async_get_catalogue_cache(self.hass).async_get()
         except BshCannotConnect:
             _LOGGER.exception("Cannot connect to BSH API to fetch station list")
             errors["base"] = BshCannotConnect.code
@@ -57,7 +78,7 @@ class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
                 errors=errors,
             )
 
-        areas = sorted({area for _, _, area in self.station_map})
+        areas = self.catalogue.areas
         _LOGGER.debug("Available areas: %s", areas)
         schema = vol.Schema({vol.Required("area"): vol.In(areas)})
 
@@ -89,16 +110,8 @@ class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
                     title=info["title"], data={"bshnr": user_input["Gauge Station"]}
                 )
 
-        # Create (bshnr: name) mapping for the dropdown. From the station map containung (bshnr, name, area) tuples
-        # and filter for previously selected area
-        options = {
-            bshnr: name
-            for bshnr, name, area in sorted(
-                self.station_map,
-                key=lambda item: item[1],  # sort by station_name
-            )
-            if area == self.area
-        }
+        # (bshnr: name) mapping of the previously selected area for the dropdown, already sorted by station_name
+        options = self.catalogue.stations(self.area)
         _LOGGER.debug(
             "Station options for area %s: %s", self.area, list(options.values())
         )
@@ -107,3 +120,54 @@ class BshTidesConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="station", data_schema=schema, errors=errors
         )
+
+
+class BshTidesOptionsFlow(OptionsFlow):
+    """Handle the options of a BSH Tides station, e.g. the bounds of the adaptive refresh interval."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the refresh interval bounds (in minutes), the decoding of the payloads and the local prediction."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if (
+                user_input[CONF_MIN_REFRESH_INTERVAL]
+                > user_input[CONF_MAX_REFRESH_INTERVAL]
+            ):
+                errors["base"] = "invalid_refresh_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        fields: dict[vol.Marker, Any] = {
+            vol.Required(
+                CONF_MIN_REFRESH_INTERVAL,
+                default=options.get(
+                    CONF_MIN_REFRESH_INTERVAL, DEFAULT_MIN_REFRESH_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+            vol.Required(
+                CONF_MAX_REFRESH_INTERVAL,
+                default=options.get(
+                    CONF_MAX_REFRESH_INTERVAL, DEFAULT_MAX_REFRESH_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+        }
+        # Streaming decode needs the optional ijson package, which Home Assistant does not ship
+        if streaming_available():
+            fields[
+                vol.Required(
+                    CONF_STREAMING_DECODE,
+                    default=options.get(CONF_STREAMING_DECODE, False),
+                )
+            ] = bool
+        fields[
+            vol.Required(
+                CONF_HARMONIC_PREDICTION,
+                default=options.get(CONF_HARMONIC_PREDICTION, False),
+            )
+        ] = bool
+        schema = vol.Schema(fields)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
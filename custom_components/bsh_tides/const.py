@@ -4,6 +4,33 @@ from enum import Enum
 
 DOMAIN = "bsh_tides"
 
+# Integration-wide objects shared by all config entries, stored in hass.data
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_CATALOGUE = f"{DOMAIN}_catalogue"
+DATA_REGISTRY = f"{DOMAIN}_registry"
+
+# Options
+CONF_MIN_REFRESH_INTERVAL = "min_refresh_interval"
+CONF_MAX_REFRESH_INTERVAL = "max_refresh_interval"
+DEFAULT_MIN_REFRESH_INTERVAL = 10  # minutes
+DEFAULT_MAX_REFRESH_INTERVAL = 120  # minutes
+CONF_STREAMING_DECODE = "streaming_decode"
+CONF_HARMONIC_PREDICTION = "harmonic_prediction"
+
+# Services
+SERVICE_GET_TIDES = "get_tides"
+ATTR_STATION = "station"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_DURATION = "duration"
+ATTR_EVENT = "event"
+ATTR_LIMIT = "limit"
+
+# Forecast types of a station, see the forecast_type sensor
+FORECAST_TYPE_PEAK = "peak_value_forecast"
+FORECAST_TYPE_CURVE = "curve_forecast"
+
 class TideEvent(str, Enum):
     HIGH = "HW"
     LOW = "NW"
@@ -1,53 +1,362 @@
 """Coordinator for BSH Tides for Germany."""
 
-from datetime import timedelta
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
 import logging
+import time
+from typing import TYPE_CHECKING, Any
 
-import dateutil.parser
+import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .bsh_api import BshApi
-from .const import TideEvent
-from .exceptions import BshApiError
+from .cadence import PublicationCadence
+from .const import (
+    CONF_MAX_REFRESH_INTERVAL,
+    CONF_HARMONIC_PREDICTION,
+    CONF_MIN_REFRESH_INTERVAL,
+    CONF_STREAMING_DECODE,
+    DEFAULT_MAX_REFRESH_INTERVAL,
+    DEFAULT_MIN_REFRESH_INTERVAL,
+    FORECAST_TYPE_CURVE,
+    FORECAST_TYPE_PEAK,
+)
+from .decoding import STATION_KEYS
+from .exceptions import BshApiError, BshCircuitOpen
+from .forecast import (
+    ForecastEvent,
+    MIN_EXTREMA_GAP,
+    ForecastIndex,
+    NextEvents,
+    find_curve_extrema,
+    parse_timestamp,
+)
+from .harmonic import TideHistory, predict_events, prediction_available
+from .interpolation import TideLevelModel
+from .statistics import ForecastStatistics
+from .telemetry import StationTelemetry, elapsed_ms
+
+if TYPE_CHECKING:
+    from .scheduler import BshRefreshScheduler
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(minutes=60)
 
+# On-disk cache of the last parsed forecast per station
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # seconds
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedForecast:
+    """The result of parsing a payload, see BshTidesCoordinator._parse().
+
+    - parse_time: Time it took to parse in ms.
+    """
+
+    created: datetime | None
+    forecast_type: str
+    events: list[ForecastEvent]
+    level_model: TideLevelModel
+    parse_time: float
+
 
 class BshTidesCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, bshnr: str):
-        self.api = BshApi(bshnr)
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        bshnr: str,
+        session: aiohttp.ClientSession | None = None,
+        scheduler: BshRefreshScheduler | None = None,
+        options: Mapping[str, Any] | None = None,
+        store: Store | None = None,
+    ):
+        options = options or {}
+        self.telemetry = StationTelemetry()
+        self.api = BshApi(
+            bshnr,
+            session,
+            options.get(CONF_STREAMING_DECODE, False),
+            self.telemetry,
+            scheduler.breaker if scheduler else None,
+        )
         self.bshnr = bshnr
+        self.cadence = PublicationCadence(
+            timedelta(
+                minutes=options.get(
+                    CONF_MIN_REFRESH_INTERVAL, DEFAULT_MIN_REFRESH_INTERVAL
+                )
+            ),
+            timedelta(
+                minutes=options.get(
+                    CONF_MAX_REFRESH_INTERVAL, DEFAULT_MAX_REFRESH_INTERVAL
+                )
+            ),
+        )
+        self.refresh_interval = SCAN_INTERVAL
+        # Options of the entry that created the coordinator, they apply to all entries of the station
+        self.options = dict(options)
+        self._scheduler = scheduler
         self._parsed_forecast_data = None
+        self._index = ForecastIndex([])
+        self._level_model = TideLevelModel([])
+        self._next_events: NextEvents | None = None
+        self._event_boundary: datetime | None = None
+        self._unsub_event_boundary: CALLBACK_TYPE | None = None
+        self.forecast_created: datetime | None = None
+        self.forecast_type: str | None = None
+        self._first_refresh: asyncio.Task[None] | None = None
+        # Seconds it took to load the forecast when the station was set up
+        self.first_refresh_duration: float | None = None
+        self._store = store
+        # True while the forecast comes from the cache, until the first fetched forecast is parsed
+        self._restored = False
+        # Levels of all forecasts so far, to predict tides beyond the BSH forecast
+        self.history = TideHistory()
+        self._prediction = (
+            options.get(CONF_HARMONIC_PREDICTION, False) and prediction_available()
+        )
+        # Hourly forecast levels in the long-term statistics of the recorder
+        self.statistics = ForecastStatistics(hass, bshnr)
+        # Number of refreshes that were parsed vs. skipped because the forecast did not change
+        self.full_refreshes = 0
+        self.skipped_refreshes = 0
+        # Number of entity state writes skipped by the sensors because their state did not change
+        self.suppressed_writes = 0
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"BSH Tides ({bshnr})",
-            update_interval=SCAN_INTERVAL,
+            # Shared by all entries of the station, the registry shuts it down with the last one
+            config_entry=None,
+            # When a scheduler is given, it owns the refresh timing of all stations
+            update_interval=None if scheduler else SCAN_INTERVAL,
         )
         _LOGGER.debug("Initialized BshTidesCoordinator for bshnr %s", bshnr)
 
     async def _async_update_data(self):
         try:
-            data = await self.api.async_fetch_data()
+            async with self._fetch_slot():
+                # Only ask for changes once we have parsed data we can keep
+                data = await self.api.async_fetch_data(
+                    conditional=self.data is not None and not self._restored
+                )
+            self.telemetry.record_success(datetime.now(UTC))
+            if self._is_unchanged(data):
+                self.skipped_refreshes += 1
+                self._update_refresh_interval()
+                _LOGGER.debug(
+                    "Forecast for %s unchanged, skipping parse (%s skipped, %s full)",
+                    self.bshnr,
+                    self.skipped_refreshes,
+                    self.full_refreshes,
+                )
+                return self.data
             _LOGGER.debug(
                 "Fetched data for %s: station=%s, creation_forecast=%s",
                 self.bshnr,
                 data.get("station_name"),
                 data.get("creation_forecast"),
             )
-            self._parse_forecast_data(data)
+            await self._async_parse_forecast_data(data)
+            if self._prediction:
+                await self._async_predict(data)
+            self.statistics.async_push(
+                self._level_model, data.get("station_name", self.bshnr)
+            )
+            self.full_refreshes += 1
+            if self._store is not None:
+                self._store.async_delay_save(
+                    partial(self._cache_snapshot, data), STORAGE_SAVE_DELAY
+                )
+            if self.forecast_created:
+                self.cadence.add(self.forecast_created)
+            self._update_refresh_interval()
             return data
+        except BshCircuitOpen as err:
+            # the breaker already logged that the BSH host is down, no need to repeat it for every station
+            self.telemetry.record_failure()
+            _LOGGER.debug("Skipped update of %s: %s", self.bshnr, err)
+            raise UpdateFailed(str(err)) from err
         except BshApiError as err:
+            self.telemetry.record_failure()
             _LOGGER.warning("BSH API error while updating data: %s", err)
             raise UpdateFailed(f"BSH API error: {err}") from err
         except Exception as err:
+            self.telemetry.record_failure()
+            # make sure the payload is parsed again on the next refresh
+            self.api.reset_validators()
             _LOGGER.exception("Unexpected error during update: %s", err)
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+    async def async_first_refresh(self) -> None:
+        """Load the forecast when the station is set up, exactly once.
+
+        A cached forecast is served right away and refreshed in the background. Without one, the forecast is
+        fetched and ConfigEntryNotReady is raised if that fails. Concurrent and repeated calls share the
+        first load, a failed one is tried again on the next call.
+        """
+        if self._first_refresh is None:
+            self._first_refresh = self.hass.async_create_task(
+                self._async_first_refresh(), f"BSH Tides first refresh {self.bshnr}"
+            )
+        try:
+            await asyncio.shield(self._first_refresh)
+        except ConfigEntryNotReady:
+            self._first_refresh = None
+            raise
+
+    async def _async_first_refresh(self) -> None:
+        started = time.perf_counter()
+        try:
+            if await self.async_restore():
+                self.hass.async_create_background_task(
+                    self.async_refresh(), f"BSH Tides refresh {self.bshnr}"
+                )
+                return
+            await self.async_refresh()
+            if not self.last_update_success:
+                raise ConfigEntryNotReady(
+                    f"BSH Tides update failed: {self.last_exception}"
+                ) from self.last_exception
+        finally:
+            self.first_refresh_duration = time.perf_counter() - started
+            _LOGGER.debug(
+                "First refresh of %s took %.3f s", self.bshnr, self.first_refresh_duration
+            )
+
+    async def async_restore(self) -> bool:
+        """Restore the last parsed forecast from the on-disk cache.
+
+        Only events which are still in the future are restored. Returns False if there is no usable cache,
+        in that case the forecast has to be fetched before the sensors can be set up.
+        """
+        if self._store is None or not (cached := await self._store.async_load()):
+            return False
+        try:
+            events = [ForecastEvent.from_dict(item) for item in cached["events"]]
+            data = cached["data"]
+            forecast_type = cached["forecast_type"]
+        except (KeyError, TypeError):
+            _LOGGER.debug("Ignoring invalid forecast cache of %s", self.bshnr)
+            return False
+        now = datetime.now(UTC)
+        events = [item for item in events if item is not None and item.time > now]
+        if not events:
+            _LOGGER.debug("Forecast cache of %s has no future events", self.bshnr)
+            return False
+
+        self.forecast_created = parse_timestamp(data.get("creation_forecast"))
+        self.forecast_type = forecast_type
+        self._set_events(events)
+        self._restored = True
+        if self._prediction:
+            self.history = TideHistory.from_dict(cached.get("history", {}))
+            await self._async_predict(data)
+        self.async_set_updated_data(data)
+        _LOGGER.debug(
+            "Restored %s cached events of %s (created %s)",
+            len(events),
+            self.bshnr,
+            self.forecast_created,
+        )
+        return True
+
+    def _cache_snapshot(self, data: dict) -> dict:
+        """Return what we keep of a parsed forecast in the on-disk cache."""
+        snapshot = {
+            "data": {key: data[key] for key in STATION_KEYS if key in data},
+            "forecast_type": self.forecast_type,
+            "events": [
+                item.as_dict()
+                for item in self._parsed_forecast_data
+                if not item.predicted
+            ],
+        }
+        if self._prediction:
+            snapshot["history"] = self.history.as_dict()
+        return snapshot
+
+    async def _async_predict(self, data: dict) -> None:
+        """Extend the BSH forecast with locally predicted tides.
+
+        The levels of the forecast are added to the history of the station, then a harmonic model is fitted to
+        the history in the executor. Its high and low tides after the last BSH event are added to the events,
+        marked as predicted. They keep the sensors going beyond the BSH forecast, e.g. during an outage.
+        """
+        events = self._parsed_forecast_data
+        mhw, mnw = data.get("MHW"), data.get("MNW")
+        if not events or mhw is None or mnw is None:
+            return
+        self.history.add_curve(*self._curve_columns(data))
+        self.history.add_events(events)
+        self.history.prune(datetime.now(UTC))
+        times, levels = self.history.columns()
+        predicted = await self.hass.async_add_executor_job(
+            predict_events,
+            times,
+            levels,
+            events[-1].time + MIN_EXTREMA_GAP,
+            float(mhw),
+            float(mnw),
+        )
+        _LOGGER.debug(
+            "Predicted %s tides for %s from %s levels",
+            len(predicted),
+            self.bshnr,
+            len(times),
+        )
+        if predicted:
+            self._set_events(events + predicted, self._level_model)
+
+    def _update_refresh_interval(self) -> None:
+        """Adapt the refresh interval to the learned publication cadence of the forecasts."""
+        self.refresh_interval = self.cadence.next_interval(datetime.now(UTC))
+        if self._scheduler is None:
+            self.update_interval = self.refresh_interval
+        _LOGGER.debug(
+            "Next refresh of %s in %s (publication slots: %s)",
+            self.bshnr,
+            self.refresh_interval,
+            self.cadence.slots,
+        )
+
+    def _fetch_slot(self):
+        """Fetch within the concurrency and rate limits of the scheduler, if there is one."""
+        if self._scheduler is None:
+            return nullcontext()
+        # The first fetch of a station is only limited in concurrency, so setting up many stations is fast
+        return self._scheduler.async_fetch_slot(rate_limited=self.data is not None)
+
+    def _is_unchanged(self, data: dict | None) -> bool:
+        """Check if a fetched payload can be skipped because the forecast did not change.
+
+        The API returns None for 304 Not Modified responses or identical payloads.
+        Otherwise we compare the creation time of the forecast with the one we already parsed.
+        A forecast restored from the cache is never considered parsed.
+        """
+        if self.data is None or self._parsed_forecast_data is None:
+            return False
+        if self._restored:
+            # the cache has no curve and only future events, so the same forecast has to be parsed once more
+            return False
+        if data is None:
+            return True
+        created = data.get("creation_forecast")
+        return created is not None and created == self.data.get("creation_forecast")
+
     @property
     def station_name(self) -> str:
         """Returns the name of the station, eg. 'Hamburg, St. Pauli, Elbe'."""
@@ -59,29 +368,167 @@ class BshTidesCoordinator(DataUpdateCoordinator):
         return self.data.get("seo_id", self.bshnr)
 
     @property
-    def forecast_data(self) -> list[dict]:
+    def forecast_data(self) -> list[ForecastEvent]:
         """Return the pre-parsed forecast data."""
         return self._parsed_forecast_data
 
+    @property
+    def index(self) -> ForecastIndex:
+        """Return the sorted index over the forecast events, rebuilt once per parsed forecast."""
+        return self._index
+
+    @property
+    def level_model(self) -> TideLevelModel:
+        """Return the model of the expected water level, rebuilt once per parsed forecast."""
+        return self._level_model
+
+    @property
+    def next_events(self) -> NextEvents:
+        """Return the next event, high and low tide.
+
+        The snapshot is cached and only recomputed once the next event has passed, so sensors can read it on
+        every state update without scanning the forecast.
+        """
+        snapshot = self._next_events
+        if snapshot is None or (
+            snapshot.valid_until is not None
+            and datetime.now(UTC) >= snapshot.valid_until
+        ):
+            snapshot = self._next_events = self._index.snapshot(datetime.now(UTC))
+        return snapshot
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners and make sure they are updated again when the next event passes."""
+        super().async_update_listeners()
+        self._async_schedule_event_boundary()
+
+    @callback
+    def _async_schedule_event_boundary(self) -> None:
+        """Arm a single callback at the time of the next event.
+
+        When the next event passes, the next tide sensors change without a refresh of the forecast.
+        """
+        boundary = self.next_events.valid_until
+        if boundary == self._event_boundary:
+            return
+        self._async_cancel_event_boundary()
+        if boundary is None:
+            return
+        self._event_boundary = boundary
+        self._unsub_event_boundary = async_track_point_in_utc_time(
+            self.hass, self._async_handle_event_boundary, boundary
+        )
+        _LOGGER.debug("Next event boundary of %s at %s", self.bshnr, boundary)
+
+    @callback
+    def _async_cancel_event_boundary(self) -> None:
+        if self._unsub_event_boundary is not None:
+            self._unsub_event_boundary()
+        self._unsub_event_boundary = None
+        self._event_boundary = None
+
+    @callback
+    def _async_handle_event_boundary(self, _now: datetime) -> None:
+        """The next event has passed, update the sensors and re-arm for the following event."""
+        self._unsub_event_boundary = None
+        self._event_boundary = None
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the event boundary callback when the coordinator is shut down."""
+        self._async_cancel_event_boundary()
+        if self._scheduler is not None:
+            self._scheduler.async_remove(self.bshnr)
+        await super().async_shutdown()
+
     def _parse_forecast_data(self, data: dict):
+        """Parse the data from the API and use it right away, see _parse()."""
+        self._apply_forecast(self._parse(data))
+
+    async def _async_parse_forecast_data(self, data: dict) -> None:
+        """Parse the data from the API in the executor, batched with other stations, and use it.
+
+        Without a scheduler, or for payloads with few items, it is parsed inline.
+        """
+        if self._scheduler is None:
+            parsed = self._parse(data)
+        else:
+            parsed = await self._scheduler.batcher.async_run(
+                partial(self._parse, data), self._payload_items(data)
+            )
+        self._apply_forecast(parsed)
+
+    def _parse(self, data: dict) -> ParsedForecast:
         """Parse the data from the API once for usage.
 
         The hwnw data contains actual forecast for the next high and low tide including expected value, deviation from mean,
         and a code for the event (HW / NW)
         Note: The hwnw data is not avaialble for all stations.
         Those who do not have it, need to use curve_forecast instead.
+
+        Both are converted once into ForecastEvent records with parsed timestamps and numeric values, sorted by time.
+        Events without a valid timestamp are dropped.
+        This does not change the coordinator, so it can run in the executor. The result is used by _apply_forecast().
         """
+        started = time.perf_counter()
+        created = parse_timestamp(data.get("creation_forecast"))
         if "hwnw_forecast" in data:
-            forecast = data.get("hwnw_forecast", {}).get("data", [])
-            for item in forecast:
-                item["forecast"] = self.parse_forecast_value(item["forecast"])
-            self._parsed_forecast_data = forecast
+            forecast_type = FORECAST_TYPE_PEAK
+            events = []
+            for item in data.get("hwnw_forecast", {}).get("data", []):
+                ts = parse_timestamp(item.get("timestamp"))
+                if ts is None:
+                    continue
+                events.append(
+                    ForecastEvent.create(
+                        ts,
+                        item.get("event"),
+                        item.get("value"),
+                        self.parse_forecast_value(item.get("forecast")),
+                    )
+                )
         else:
             _LOGGER.warning(
                 "No hwnw_forecast data available for station %s, using curve_forecast instead",
                 self.bshnr,
             )
-            self._parsed_forecast_data = self._find_curve_extrema(data)
+            forecast_type = FORECAST_TYPE_CURVE
+            events = self._find_curve_extrema(data)
+        return ParsedForecast(
+            created=created,
+            forecast_type=forecast_type,
+            events=events,
+            level_model=TideLevelModel.from_curve(*self._curve_columns(data)),
+            parse_time=elapsed_ms(started),
+        )
+
+    def _apply_forecast(self, parsed: ParsedForecast) -> None:
+        self.forecast_created = parsed.created
+        self.forecast_type = parsed.forecast_type
+        self._set_events(parsed.events, parsed.level_model)
+        self._restored = False
+        self.telemetry.parse_time.add(parsed.parse_time)
+
+    @staticmethod
+    def _payload_items(data: dict) -> int:
+        """Return the number of forecast items of a payload, a measure of how long parsing takes."""
+        curve = data.get("curve_forecast", {})
+        return len(data.get("hwnw_forecast", {}).get("data", [])) + len(
+            curve.get("timestamps", curve.get("data", []))
+        )
+
+    def _set_events(
+        self, events: list[ForecastEvent], level_model: TideLevelModel | None = None
+    ) -> None:
+        """Index the events and reset the next events snapshot.
+
+        The water level is interpolated along the curve forecast if there is one, otherwise between the events.
+        """
+        self._index = ForecastIndex(events)
+        self._parsed_forecast_data = self._index.events
+        self._next_events = None
+        self._level_model = level_model or TideLevelModel.from_events(self._index.events)
 
     def parse_forecast_value(self, forecast: str) -> float | None:
         """Parse a forecast string (e.g. "+/-0,0 m", "-0,1 m", "+0,2 m") into a float value."""
@@ -102,79 +549,26 @@ class BshTidesCoordinator(DataUpdateCoordinator):
             _LOGGER.debug("Failed to parse forecast value: %s", e)
             return None
 
-    def _find_curve_extrema(self, data: list[dict]) -> list[dict]:
+    def _find_curve_extrema(self, data: dict) -> list[ForecastEvent]:
         """Find significant local minima (NW) and maxima (HW) in curve_forecast.
 
         We only consider extrema that are at least 45 minutes apart to avoid noise.
-        The returned list contains dictionaries with the following keys:
-        - "timestamp": The timestamp of the extremum.
-        - "value": The value of the extremum.
-        - "event": The type of event (TideEvent.HIGH or TideEvent.LOW).
-        - "forecast": The forecast value for the extremum, relative diff to MHW or MNW.
-
-        It returns the same data format as hwnw_forecast.
+        The extrema are returned as ForecastEvent records, like the events of the hwnw_forecast. Their forecast is
+        the relative diff of the value to MHW or MNW.
         """
-        extrema = []
-        min_gap = timedelta(minutes=45)
-        last_extremum_time = None
-        last_extremum_value = None
-        last_extremum_event = None
-        curve = data.get("curve_forecast", {}).get("data", [])
-
-        for i in range(1, len(curve) - 1):
-            prev = curve[i - 1]
-            curr = curve[i]
-            nxt = curve[i + 1]
-
-            # curveforecast will only be set for future values, which is what we are looking for anyway.
-            val = curr.get("curveforecast") or None
-            prev_val = prev.get("curveforecast") or None
-            next_val = nxt.get("curveforecast") or None
-
-            if val is None or prev_val is None or next_val is None:
-                continue
-
-            is_max = prev_val < val >= next_val
-            is_min = prev_val > val <= next_val
-
-            if not (is_max or is_min):
-                continue
-
-            ts = dateutil.parser.parse(curr["timestamp"])
-
-            is_in_fluctuation_period = last_extremum_time and abs(ts - last_extremum_time) < min_gap
-
-            if is_in_fluctuation_period:
-                # in the fluctuation_period, we check if we move further into the same direction (this skips small fluctuations in the other direction)
-                # we select the new reading, iff it is a stronger extremum in the same direction
-                if last_extremum_event == TideEvent.HIGH.value and val < last_extremum_value:
-                    continue
-                if last_extremum_event == TideEvent.LOW.value and val > last_extremum_value:
-                    continue 
-
-            if is_max:
-                event = TideEvent.HIGH.value
-                forecast = val - data.get("MHW", {})
-            else:
-                event = TideEvent.LOW.value
-                forecast = val - data.get("MNW", {})
-
-            new_event = (
-                {
-                    "timestamp": curr["timestamp"],
-                    "value": val,
-                    "event": event,
-                    "forecast": forecast,
-                }
-            )
-
-            if is_in_fluctuation_period:
-                extrema[-1] = new_event
-            else:
-                extrema.append(new_event)
-
-            last_extremum_time = ts
-            last_extremum_value = val
-            last_extremum_event = event
+        timestamps, values = self._curve_columns(data)
+        return find_curve_extrema(
+            timestamps, values, data.get("MHW", {}), data.get("MNW", {})
+        )
 
-        return extrema
+    @staticmethod
+    def _curve_columns(data: dict) -> tuple[list[str], list[int | float | None]]:
+        """Return the timestamps and the curveforecast values of the curve_forecast."""
+        curve = data.get("curve_forecast", {})
+        if "timestamps" in curve:
+            # the streaming decoder already returns the curve as columns
+            return curve["timestamps"], curve["values"]
+        timestamps = [item["timestamp"] for item in curve.get("data", [])]
+        # curveforecast will only be set for future values, which is what we are looking for anyway.
+        values = [item.get("curveforecast") for item in curve.get("data", [])]
+        return timestamps, values
@@ -0,0 +1,137 @@
+"""Decoding of the BSH station payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import hashlib
+import json
+from typing import Any, Protocol
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, without it the payload is decoded at once
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional (but shipped with Home Assistant), without it json is used
+    orjson = None
+
+# Top level values of a station payload that are used by the integration
+STATION_KEYS = frozenset(
+    {
+        "station_name",
+        "seo_id",
+        "MHW",
+        "MNW",
+        "area",
+        "creation_forecast",
+        "copyright_note",
+    }
+)
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+
+_HWNW_ITEM = "hwnw_forecast.data.item"
+_CURVE_ITEM = "curve_forecast.data.item"
+
+
+class AsyncReader(Protocol):
+    """An object with an async read method, e.g. aiohttp's StreamReader."""
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to n bytes."""
+
+
+class HashingReader:
+    """Wraps an async reader and hashes and counts all bytes read through it."""
+
+    def __init__(self, reader: AsyncReader):
+        self._reader = reader
+        self._hash = hashlib.blake2b(digest_size=16)
+        self.size = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        chunk = await self._reader.read(n)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def json_loads(body: bytes) -> Any:
+    """Decode a JSON body, with orjson if it is installed, else with the json module.
+
+    orjson decodes the bytes directly, without decoding them to a str first, and is several times faster
+    for the large curve payloads. Raises ValueError for invalid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def missing_keys(body: bytes, keys: Iterable[str]) -> list[str]:
+    """Return the keys which do not occur in the raw JSON body, without decoding it.
+
+    This is a plain bytes search for the quoted key, so a key nested anywhere counts as found. It is meant to
+    reject payloads which cannot be valid early, the decoded data has to be checked all the same.
+    """
+    return [key for key in keys if f'"{key}"'.encode() not in body]
+
+
+def streaming_available() -> bool:
+    """Return if the optional ijson package for streaming decoding is installed."""
+    return ijson is not None
+
+
+async def async_decode_station_stream(reader: AsyncReader) -> dict:
+    """Decode a station payload while it is read, keeping only what the integration uses.
+
+    The result contains the STATION_KEYS, the complete hwnw_forecast, and the curve_forecast reduced to two
+    columns: {"timestamps": [...], "values": [...]} with the timestamp and curveforecast of every item.
+    All other parts of the payload (e.g. astro and measurement values of the curve) are skipped
+    without building Python objects for them. A "gauges" key is kept, so a station list can be detected.
+
+    Raises ValueError for invalid JSON.
+    """
+    data: dict = {}
+    hwnw: list[dict] | None = None
+    item_builder = None
+    timestamps: list[str | None] | None = None
+    values: list[float | None] = []
+
+    try:
+        async for prefix, event, value in ijson.parse_async(reader, use_float=True):
+            if item_builder is not None:
+                item_builder.event(event, value)
+                if prefix == _HWNW_ITEM and event == "end_map":
+                    hwnw.append(item_builder.value)
+                    item_builder = None
+            elif prefix == _CURVE_ITEM:
+                if event == "start_map":
+                    timestamps.append(None)
+                    values.append(None)
+            elif prefix == f"{_CURVE_ITEM}.timestamp":
+                timestamps[-1] = value
+            elif prefix == f"{_CURVE_ITEM}.curveforecast":
+                values[-1] = value
+            elif prefix == _HWNW_ITEM and event == "start_map":
+                item_builder = ijson.ObjectBuilder()
+                item_builder.event(event, value)
+            elif prefix == "hwnw_forecast" and event == "start_map":
+                hwnw = []
+            elif prefix == "curve_forecast" and event == "start_map":
+                timestamps = []
+            elif prefix in STATION_KEYS and event in _SCALAR_EVENTS:
+                data[prefix] = value
+            elif prefix == "gauges" and event == "start_array":
+                data["gauges"] = None
+    except ijson.JSONError as err:
+        raise ValueError(f"Invalid JSON: {err}") from err
+
+    if hwnw is not None:
+        data["hwnw_forecast"] = {"data": hwnw}
+    if timestamps is not None:
+        data["curve_forecast"] = {"timestamps": timestamps, "values": values}
+    return data
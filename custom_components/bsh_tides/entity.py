@@ -0,0 +1,31 @@
+"""Base entity of the BSH Tides for Germany integration."""
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import BshTidesCoordinator
+
+
+class BshEntity(CoordinatorEntity[BshTidesCoordinator]):
+    """Common device info and attribution of all BSH Tides entities of a station."""
+
+    def __init__(self, coordinator: BshTidesCoordinator):
+        super().__init__(coordinator)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.bshnr)},
+            "name": f"BSH {coordinator.station_name}",
+            "manufacturer": "BSH",
+            "entry_type": "service",
+        }
+        self._attr_attribution = coordinator.data.get(
+            "copyright_note",
+            "© BSH – Bundesamt für Seeschifffahrt und Hydrographie",
+        )
+
+        # The _attr_has_entity_name is decisive for having nicely combined entity names like "sensor.bsh_eider_sperrwerk_aussenpegel_mean_high_water_level"
+        # instead of just sensor.mean_high_water_level which would be ambiguous for multiple entities.
+        self._attr_has_entity_name = True
+
+    @property
+    def unique_id(self):
+        return f"bsh_{self.coordinator.seo_id}_{self._attr_translation_key}"
@@ -7,4 +7,7 @@ class BshCannotConnect(BshApiError):
 
 class BshInvalidStation(BshApiError):
     """Raised when station response is invalid."""
-    code = "invalid_station"
\ No newline at end of file
+    code = "invalid_station"
+
+class BshCircuitOpen(BshCannotConnect):
+    """Raised instead of a request while the BSH host is considered down, see breaker.BshCircuitBreaker."""
@@ -0,0 +1,306 @@
+"""Parsing helpers and indexes for the forecast data of a station."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+
+import dateutil.parser
+
+from homeassistant.util import dt as dt_util
+
+from .const import TideEvent
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, there is a pure Python fallback
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Extrema of the curve forecast closer than this are considered fluctuations around the same tide
+MIN_EXTREMA_GAP = timedelta(minutes=45)
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a BSH timestamp (e.g. "2025-07-13 14:30:00+02:00") into a timezone-aware UTC datetime.
+
+    The ISO format of the API is handled by the fast datetime.fromisoformat, dateutil is only the fallback.
+    Timestamps without offset are interpreted in the time zone of Home Assistant.
+    """
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            ts = dateutil.parser.parse(value)
+        except (ValueError, OverflowError):
+            _LOGGER.debug("Failed to parse timestamp: %s", value)
+            return None
+    return dt_util.as_utc(ts)
+
+
+def find_curve_extrema(
+    timestamps: Sequence[str],
+    values: Sequence[int | float | None],
+    mhw: float,
+    mnw: float,
+    use_numpy: bool | None = None,
+) -> list[ForecastEvent]:
+    """Find significant local minima (NW) and maxima (HW) in the columns of a curve forecast.
+
+    Candidates are points which are higher (lower) than their predecessor and at least as high (low) as their
+    successor. Candidates within MIN_EXTREMA_GAP of the last extremum only replace it, if they are a stronger
+    extremum in the same direction. Empty values (None or 0) are not considered.
+
+    The candidates are found with numpy if available, otherwise in pure Python. Both produce the same result.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        candidates = _extrema_candidates_numpy(values)
+    else:
+        candidates = _extrema_candidates_python(values)
+    return _select_extrema(candidates, timestamps, values, mhw, mnw)
+
+
+def _extrema_candidates_python(
+    values: Sequence[int | float | None],
+) -> Iterable[tuple[int, bool]]:
+    """Yield (index, is_max) of all local extrema, one item at a time."""
+    for i in range(1, len(values) - 1):
+        val = values[i] or None
+        prev_val = values[i - 1] or None
+        next_val = values[i + 1] or None
+
+        if val is None or prev_val is None or next_val is None:
+            continue
+
+        is_max = prev_val < val >= next_val
+        is_min = prev_val > val <= next_val
+
+        if is_max or is_min:
+            yield i, is_max
+
+
+def _extrema_candidates_numpy(
+    values: Sequence[int | float | None],
+) -> Iterable[tuple[int, bool]]:
+    """Return (index, is_max) of all local extrema, found with array operations."""
+    # empty values become NaN, every comparison with NaN is False
+    curve = np.array([val or np.nan for val in values], dtype=float)
+    if len(curve) < 3:
+        return []
+    prev_val, val, next_val = curve[:-2], curve[1:-1], curve[2:]
+    is_max = (prev_val < val) & (val >= next_val)
+    is_min = (prev_val > val) & (val <= next_val)
+    indices = np.flatnonzero(is_max | is_min)
+    return zip((indices + 1).tolist(), is_max[indices].tolist())
+
+
+def _select_extrema(
+    candidates: Iterable[tuple[int, bool]],
+    timestamps: Sequence[str],
+    values: Sequence[int | float | None],
+    mhw: float,
+    mnw: float,
+) -> list[ForecastEvent]:
+    """Apply the minimum gap rule to the candidates and build the events."""
+    extrema = []
+    last_extremum_time = None
+    last_extremum_value = None
+    last_extremum_event = None
+
+    for i, is_max in candidates:
+        val = values[i]
+        ts = parse_timestamp(timestamps[i])
+
+        is_in_fluctuation_period = (
+            last_extremum_time and abs(ts - last_extremum_time) < MIN_EXTREMA_GAP
+        )
+
+        if is_in_fluctuation_period:
+            # in the fluctuation_period, we check if we move further into the same direction (this skips small fluctuations in the other direction)
+            # we select the new reading, iff it is a stronger extremum in the same direction
+            if last_extremum_event == TideEvent.HIGH.value and val < last_extremum_value:
+                continue
+            if last_extremum_event == TideEvent.LOW.value and val > last_extremum_value:
+                continue
+
+        if is_max:
+            event = TideEvent.HIGH.value
+            forecast = val - mhw
+        else:
+            event = TideEvent.LOW.value
+            forecast = val - mnw
+
+        new_event = ForecastEvent.create(ts, event, val, forecast)
+
+        if is_in_fluctuation_period:
+            extrema[-1] = new_event
+        else:
+            extrema.append(new_event)
+
+        last_extremum_time = ts
+        last_extremum_value = val
+        last_extremum_event = event
+
+    return extrema
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastEvent:
+    """A high or low tide event of the forecast, holding already converted values.
+
+    - time: The time of the event as UTC datetime.
+    - event: The type of event (TideEvent.HIGH or TideEvent.LOW value).
+    - value: The expected water level in cm.
+    - level: The expected water level rounded to full cm.
+    - forecast: The expected deviation from the mean high/low water level in cm.
+    - predicted: True if the event was predicted locally instead of being part of the BSH forecast.
+    Values which could not be converted are None.
+    """
+
+    time: datetime
+    event: str | None
+    value: float | None
+    level: int | None
+    forecast: int | None
+    predicted: bool = False
+
+    @classmethod
+    def create(
+        cls, time: datetime, event: str | None, value, forecast, predicted: bool = False
+    ) -> ForecastEvent:
+        """Create an event from the raw values of the API."""
+        value = _to_float(value)
+        return cls(
+            time=time,
+            event=event,
+            value=value,
+            level=round(value) if value is not None else None,
+            forecast=_to_int(forecast),
+            predicted=predicted,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the event as JSON serializable dict, e.g. for the on-disk cache."""
+        return {
+            "time": self.time.isoformat(),
+            "event": self.event,
+            "value": self.value,
+            "forecast": self.forecast,
+            "predicted": self.predicted,
+        }
+
+    @classmethod
+    def from_dict(cls, item: dict) -> ForecastEvent | None:
+        """Create an event from a dict of as_dict(), None if the time is invalid."""
+        time = parse_timestamp(item.get("time"))
+        if time is None:
+            return None
+        return cls.create(
+            time,
+            item.get("event"),
+            item.get("value"),
+            item.get("forecast"),
+            bool(item.get("predicted", False)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class NextEvents:
+    """The upcoming events at a point in time, shared by all sensors of a station.
+
+    The snapshot stays valid until valid_until, the time of the next event. After that, the next event is in
+    the past and the snapshot has to be recomputed.
+    """
+
+    next: ForecastEvent | None
+    high: ForecastEvent | None
+    low: ForecastEvent | None
+    valid_until: datetime | None
+
+    def get(self, event: TideEvent | None = None) -> ForecastEvent | None:
+        """Return the next event of the given type, or the next event of any type."""
+        if event == TideEvent.HIGH:
+            return self.high
+        if event == TideEvent.LOW:
+            return self.low
+        return self.next
+
+
+class ForecastIndex:
+    """Sorted index over the forecast events with separate lanes for high and low tides.
+
+    Lookups of the next event after a point in time are bisects over the sorted epoch times of a lane.
+    """
+
+    def __init__(self, events: list[ForecastEvent]):
+        self.events = sorted(events, key=lambda item: item.time)
+        self._lanes: dict[
+            TideEvent | None, tuple[list[float], list[ForecastEvent]]
+        ] = {None: self._lane(self.events)}
+        for event in TideEvent:
+            self._lanes[event] = self._lane(
+                [item for item in self.events if item.event == event.value]
+            )
+
+    @staticmethod
+    def _lane(events: list[ForecastEvent]) -> tuple[list[float], list[ForecastEvent]]:
+        return [item.time.timestamp() for item in events], events
+
+    def next_event(
+        self, now: datetime, event: TideEvent | None = None
+    ) -> ForecastEvent | None:
+        """Return the first event (of the given type) strictly after now."""
+        times, events = self._lanes[event]
+        i = bisect_right(times, now.timestamp())
+        return events[i] if i < len(events) else None
+
+    def between(
+        self,
+        start: datetime,
+        end: datetime | None = None,
+        event: TideEvent | None = None,
+        limit: int | None = None,
+    ) -> list[ForecastEvent]:
+        """Return the events (of the given type) from start (inclusive) to end (exclusive), sorted by time.
+
+        Without end, all events from start on are returned. The window is found with two bisects,
+        only the returned events (at most limit) are copied.
+        """
+        times, events = self._lanes[event]
+        lo = bisect_left(times, start.timestamp())
+        hi = bisect_left(times, end.timestamp()) if end is not None else len(times)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return events[lo:hi]
+
+    def snapshot(self, now: datetime) -> NextEvents:
+        """Look up the next event, high and low tide at once."""
+        next_event = self.next_event(now)
+        return NextEvents(
+            next=next_event,
+            high=self.next_event(now, TideEvent.HIGH),
+            low=self.next_event(now, TideEvent.LOW),
+            valid_until=next_event.time if next_event else None,
+        )
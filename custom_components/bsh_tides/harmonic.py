@@ -0,0 +1,193 @@
+"""Local harmonic tide prediction of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import Any
+
+from .forecast import ForecastEvent, find_curve_extrema, parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, without it there is no local prediction
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Angular speeds of the tidal constituents in degrees per hour, in the order they are added to a fit
+CONSTITUENTS = {
+    "M2": 28.9841042,
+    "S2": 30.0,
+    "N2": 28.4397295,
+    "K1": 15.0410686,
+    "O1": 13.9430356,
+    "M4": 57.9682084,
+    "MS4": 58.9841042,
+    "K2": 30.0821373,
+    "P1": 14.9589314,
+    "MN4": 57.4238337,
+    "M6": 86.9523127,
+}
+# The history is kept on a grid of this resolution, plus the exact times of the high and low tides
+HISTORY_RESOLUTION = timedelta(minutes=30)
+HISTORY_SIZE = timedelta(days=30)
+# A fit needs at least one full cycle of the diurnal constituents
+MIN_FIT_SPAN = timedelta(hours=25)
+PREDICTION_HORIZON = timedelta(days=7)
+PREDICTION_STEP = timedelta(minutes=10)
+
+
+def prediction_available() -> bool:
+    """Return True if numpy is installed, which is needed for the fit."""
+    return np is not None
+
+
+def select_constituents(span: timedelta) -> list[str]:
+    """Return the constituents which can be separated from each other within the span of the history.
+
+    Two constituents can only be told apart if the history covers at least one period of their beat frequency
+    (Rayleigh criterion), e.g. 15 days for M2 and S2. Constituents are added in the order of CONSTITUENTS.
+    """
+    hours = span.total_seconds() / 3600
+    selected: list[str] = []
+    for name, speed in CONSTITUENTS.items():
+        if all(
+            hours * abs(speed - CONSTITUENTS[other]) >= 360 for other in selected
+        ):
+            selected.append(name)
+    return selected
+
+
+class TideHistory:
+    """Accumulated water levels of a station from all forecasts received so far.
+
+    Levels are kept per time, a newer forecast replaces the level of an older one. Curve forecasts are reduced to
+    the HISTORY_RESOLUTION grid, high and low tides are kept at their exact time.
+    """
+
+    def __init__(self, samples: dict[int, float] | None = None):
+        # epoch seconds -> level in cm
+        self._samples: dict[int, float] = dict(samples or {})
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add_curve(
+        self, timestamps: Sequence[str], values: Sequence[int | float | None]
+    ) -> None:
+        """Add the columns of a curve forecast. Empty values (None or 0) are skipped."""
+        resolution = int(HISTORY_RESOLUTION.total_seconds())
+        for timestamp, value in zip(timestamps, values):
+            if not value or (time := parse_timestamp(timestamp)) is None:
+                continue
+            ts = int(time.timestamp())
+            if ts % resolution == 0:
+                self._samples[ts] = float(value)
+
+    def add_events(self, events: Iterable[ForecastEvent]) -> None:
+        """Add the levels of high and low tides of the BSH forecast."""
+        for item in events:
+            if item.value is not None and not item.predicted:
+                self._samples[int(item.time.timestamp())] = item.value
+
+    def prune(self, now: datetime) -> None:
+        """Drop the levels older than HISTORY_SIZE."""
+        oldest = (now - HISTORY_SIZE).timestamp()
+        self._samples = {ts: level for ts, level in self._samples.items() if ts >= oldest}
+
+    def columns(self) -> tuple[list[int], list[float]]:
+        """Return the times (epoch seconds) and levels sorted by time."""
+        times = sorted(self._samples)
+        return times, [self._samples[ts] for ts in times]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history as JSON serializable dict for the on-disk cache."""
+        times, levels = self.columns()
+        return {"times": times, "levels": levels}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TideHistory:
+        """Create a history from a dict of as_dict()."""
+        return cls(dict(zip(data.get("times", []), data.get("levels", []))))
+
+
+class HarmonicModel:
+    """The water level as sum of the mean level and sine waves of the tidal constituents.
+
+    The amplitudes and phases are fitted to the history with a single least squares solve. This is CPU bound,
+    so fit() and predict_events() should run in the executor.
+    """
+
+    def __init__(
+        self, constituents: list[str], reference: float, coefficients: np.ndarray
+    ):
+        self.constituents = constituents
+        self._reference = reference
+        self._speeds = np.radians([CONSTITUENTS[name] for name in constituents])
+        self._coefficients = coefficients
+
+    @classmethod
+    def fit(cls, times: Sequence[float], levels: Sequence[float]) -> HarmonicModel | None:
+        """Fit the model to the levels at the given times (epoch seconds), None if the history is too short."""
+        if np is None or len(times) < 2:
+            return None
+        span = timedelta(seconds=times[-1] - times[0])
+        if span < MIN_FIT_SPAN:
+            return None
+        constituents = select_constituents(span)
+        speeds = np.radians([CONSTITUENTS[name] for name in constituents])
+        design = cls._design(cls._hours(times, times[0]), speeds)
+        if design.shape[0] <= design.shape[1]:
+            return None
+        coefficients, *_ = np.linalg.lstsq(
+            design, np.asarray(levels, dtype=float), rcond=None
+        )
+        _LOGGER.debug("Fitted %s to %s levels over %s", constituents, len(times), span)
+        return cls(constituents, times[0], coefficients)
+
+    @staticmethod
+    def _hours(times: Sequence[float], reference: float) -> np.ndarray:
+        return (np.asarray(times, dtype=float) - reference) / 3600
+
+    @staticmethod
+    def _design(hours: np.ndarray, speeds: np.ndarray) -> np.ndarray:
+        """Return the design matrix with the columns 1, cos(w * t) and sin(w * t) for every constituent."""
+        phases = np.outer(hours, speeds)
+        return np.hstack((np.ones((len(hours), 1)), np.cos(phases), np.sin(phases)))
+
+    def predict(self, times: Sequence[float]) -> np.ndarray:
+        """Return the predicted levels at the given times (epoch seconds)."""
+        hours = self._hours(times, self._reference)
+        return self._design(hours, self._speeds) @ self._coefficients
+
+    def predict_events(
+        self, start: datetime, end: datetime, mhw: float, mnw: float
+    ) -> list[ForecastEvent]:
+        """Return the predicted high and low tides between start and end, marked as predicted."""
+        step = PREDICTION_STEP.total_seconds()
+        times = np.arange(start.timestamp(), end.timestamp(), step)
+        levels = self.predict(times)
+        timestamps = [datetime.fromtimestamp(ts, UTC).isoformat() for ts in times.tolist()]
+        return [
+            replace(item, predicted=True)
+            for item in find_curve_extrema(timestamps, levels.tolist(), mhw, mnw)
+        ]
+
+
+def predict_events(
+    times: Sequence[float],
+    levels: Sequence[float],
+    start: datetime,
+    mhw: float,
+    mnw: float,
+) -> list[ForecastEvent]:
+    """Fit a model to the history and predict the tides of PREDICTION_HORIZON after start.
+
+    Returns an empty list if the history is too short for a fit.
+    """
+    if (model := HarmonicModel.fit(times, levels)) is None:
+        return []
+    return model.predict_events(start, start + PREDICTION_HORIZON, mhw, mnw)
@@ -0,0 +1,78 @@
+"""Water level between the forecast points of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+import math
+
+from .forecast import ForecastEvent, parse_timestamp
+
+
+class TideLevelModel:
+    """Answers the expected water level (cm) at any time within the forecast.
+
+    The model is built once per refresh from sorted (time, level) points, a lookup is a bisect plus one interpolation.
+    Between the points of a curve forecast (10 minutes apart) the level is interpolated linearly.
+    Between high and low tide events it follows half a cosine wave, which is close to the real shape of a tide.
+    """
+
+    __slots__ = ("_cosine", "_levels", "_times")
+
+    def __init__(self, points: Iterable[tuple[float, float]], cosine: bool = False):
+        points = sorted(points)
+        self._times = [time for time, _ in points]
+        self._levels = [level for _, level in points]
+        self._cosine = cosine
+
+    @classmethod
+    def from_curve(
+        cls, timestamps: Sequence[str], values: Sequence[int | float | None]
+    ) -> TideLevelModel:
+        """Create a linear model from the columns of a curve forecast. Empty values (None or 0) are skipped."""
+        points = []
+        for timestamp, value in zip(timestamps, values):
+            if not value:
+                continue
+            if (time := parse_timestamp(timestamp)) is not None:
+                points.append((time.timestamp(), float(value)))
+        return cls(points)
+
+    @classmethod
+    def from_events(cls, events: Iterable[ForecastEvent]) -> TideLevelModel:
+        """Create a cosine model from high and low tide events."""
+        return cls(
+            ((item.time.timestamp(), item.value) for item in events if item.value is not None),
+            cosine=True,
+        )
+
+    def __bool__(self) -> bool:
+        """Return True if the model has enough points to interpolate."""
+        return len(self._times) > 1
+
+    @property
+    def span(self) -> tuple[datetime, datetime] | None:
+        """Return the first and last time of the model, None if it cannot interpolate."""
+        if not self:
+            return None
+        return (
+            datetime.fromtimestamp(self._times[0], UTC),
+            datetime.fromtimestamp(self._times[-1], UTC),
+        )
+
+    def level(self, time: datetime) -> float | None:
+        """Return the expected water level at the given time, None outside of the forecast."""
+        ts = time.timestamp()
+        times = self._times
+        if not self or not times[0] <= ts <= times[-1]:
+            return None
+        i = bisect_right(times, ts)
+        if i == len(times):
+            return self._levels[-1]
+        t0, t1 = times[i - 1], times[i]
+        v0, v1 = self._levels[i - 1], self._levels[i]
+        fraction = (ts - t0) / (t1 - t0)
+        if self._cosine:
+            fraction = (1 - math.cos(math.pi * fraction)) / 2
+        return v0 + (v1 - v0) * fraction
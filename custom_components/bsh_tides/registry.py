@@ -0,0 +1,78 @@
+"""Shared coordinators per station of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_REGISTRY
+
+if TYPE_CHECKING:
+    from .coordinator import BshTidesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> BshCoordinatorRegistry:
+    """Return the coordinator registry shared by all BSH Tides entries, creating it on first use."""
+    registry: BshCoordinatorRegistry | None = hass.data.get(DATA_REGISTRY)
+    if registry is None:
+        registry = hass.data[DATA_REGISTRY] = BshCoordinatorRegistry(hass)
+    return registry
+
+
+class BshCoordinatorRegistry:
+    """Hands out one coordinator per station, reference counted across config entries.
+
+    If a station is configured more than once, all entries share the coordinator of the first one,
+    so the station is fetched and parsed only once per refresh. The coordinator is shut down when
+    the last entry releases it.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self._coordinators: dict[str, BshTidesCoordinator] = {}
+        self._refs: dict[str, int] = {}
+        # Coordinators which are still being created, e.g. waiting for their first refresh
+        self._pending: dict[str, asyncio.Task[BshTidesCoordinator]] = {}
+
+    async def async_acquire(
+        self, bshnr: str, create: Callable[[], Awaitable[BshTidesCoordinator]]
+    ) -> BshTidesCoordinator:
+        """Return the coordinator of a station, creating it with create() if there is none yet.
+
+        Entries which acquire the same station while it is created wait for it. If the creation fails,
+        all of them get the error and the next acquire tries again.
+        """
+        if (coordinator := self._coordinators.get(bshnr)) is None:
+            task = self._pending.get(bshnr)
+            if task is None:
+                task = self._pending[bshnr] = self.hass.async_create_task(
+                    create(), f"Create BSH Tides coordinator {bshnr}"
+                )
+                task.add_done_callback(lambda _: self._pending.pop(bshnr, None))
+            coordinator = await asyncio.shield(task)
+            self._coordinators.setdefault(bshnr, coordinator)
+        self._refs[bshnr] = self._refs.get(bshnr, 0) + 1
+        _LOGGER.debug("Acquired coordinator of %s (%s users)", bshnr, self._refs[bshnr])
+        return coordinator
+
+    async def async_release(self, bshnr: str) -> None:
+        """Release a coordinator acquired before, shutting it down with the last reference."""
+        refs = self._refs.get(bshnr, 0) - 1
+        if refs > 0:
+            self._refs[bshnr] = refs
+            return
+        self._refs.pop(bshnr, None)
+        if (coordinator := self._coordinators.pop(bshnr, None)) is not None:
+            _LOGGER.debug("Shutting down coordinator of %s", bshnr)
+            await coordinator.async_shutdown()
+
+    def get(self, bshnr: str) -> BshTidesCoordinator | None:
+        """Return the coordinator of a station if it was acquired by any entry."""
+        return self._coordinators.get(bshnr)
@@ -0,0 +1,138 @@
+"""Integration-wide refresh scheduler for BSH Tides for Germany."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import time
+from typing import TYPE_CHECKING
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .batching import BshJobBatcher
+from .breaker import BshCircuitBreaker
+from .const import DATA_SCHEDULER
+
+if TYPE_CHECKING:
+    from .coordinator import BshTidesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bound of parallel requests to the BSH server across all stations
+MAX_CONCURRENT_FETCHES = 4
+# Global rate budget, requests are spaced evenly to stay below it
+MAX_REQUESTS_PER_MINUTE = 30
+# Refresh slots of the stations are spread over windows of this length
+SLOT_WINDOW = timedelta(minutes=60)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> BshRefreshScheduler:
+    """Return the scheduler shared by all BSH Tides entries, creating it on first use."""
+    scheduler: BshRefreshScheduler | None = hass.data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_SCHEDULER] = BshRefreshScheduler(hass)
+    return scheduler
+
+
+class BshRefreshScheduler:
+    """Owns the refresh timing of all station coordinators.
+
+    Every station refreshes on its own slot within the refresh interval. The slot offset is derived from the bshnr,
+    so it is stable across restarts and the stations are spread evenly instead of all refreshing in the same second.
+    All fetches go through async_fetch_slot() which caps the number of concurrent requests and enforces
+    a global rate budget. The circuit breaker of the BSH host is shared the same way, as is the batcher which
+    parses the fetched forecasts in the executor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = MAX_CONCURRENT_FETCHES,
+        requests_per_minute: int = MAX_REQUESTS_PER_MINUTE,
+    ):
+        self.hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._request_spacing = 60.0 / requests_per_minute
+        self._next_request_at = 0.0
+        self.breaker = BshCircuitBreaker()
+        self.batcher = BshJobBatcher(hass)
+        self._coordinators: dict[str, BshTidesCoordinator] = {}
+        self._unsub_refresh: dict[str, CALLBACK_TYPE] = {}
+
+    @staticmethod
+    def jitter(bshnr: str, interval: timedelta) -> timedelta:
+        """Return the deterministic offset of a station within the refresh interval."""
+        return interval * (zlib.crc32(bshnr.encode()) / 0xFFFFFFFF)
+
+    def next_refresh_delay(self, coordinator: BshTidesCoordinator) -> float:
+        """Seconds until the next refresh slot of the station.
+
+        Slots repeat every SLOT_WINDOW (or the refresh interval if shorter) at the offset given by jitter(),
+        aligned to the wall clock. We pick the first slot within the last window before the refresh interval
+        of the coordinator has passed, so a refresh is never later than requested.
+        """
+        period = coordinator.refresh_interval.total_seconds()
+        window = min(coordinator.refresh_interval, SLOT_WINDOW)
+        offset = self.jitter(coordinator.bshnr, window).total_seconds()
+        window = window.total_seconds()
+        earliest = time.time() + period - window
+        return period - window + (offset - earliest) % window
+
+    @callback
+    def async_add(self, coordinator: BshTidesCoordinator) -> CALLBACK_TYPE:
+        """Start scheduling refreshes for a coordinator, returns a callback to stop it again."""
+        self._coordinators[coordinator.bshnr] = coordinator
+        self._async_schedule_refresh(coordinator)
+        return partial(self.async_remove, coordinator.bshnr)
+
+    @callback
+    def async_remove(self, bshnr: str) -> None:
+        """Stop scheduling refreshes for a station."""
+        self._coordinators.pop(bshnr, None)
+        if unsub := self._unsub_refresh.pop(bshnr, None):
+            unsub()
+
+    @callback
+    def _async_schedule_refresh(self, coordinator: BshTidesCoordinator) -> None:
+        if unsub := self._unsub_refresh.pop(coordinator.bshnr, None):
+            unsub()
+        delay = self.next_refresh_delay(coordinator)
+        _LOGGER.debug("Next refresh of %s in %.0f s", coordinator.bshnr, delay)
+        self._unsub_refresh[coordinator.bshnr] = async_call_later(
+            self.hass, delay, partial(self._async_refresh, coordinator)
+        )
+
+    async def _async_refresh(
+        self, coordinator: BshTidesCoordinator, _now: datetime
+    ) -> None:
+        self._unsub_refresh.pop(coordinator.bshnr, None)
+        try:
+            await coordinator.async_refresh()
+        finally:
+            if self._coordinators.get(coordinator.bshnr) is coordinator:
+                self._async_schedule_refresh(coordinator)
+
+    @asynccontextmanager
+    async def async_fetch_slot(self, rate_limited: bool = True) -> AsyncIterator[None]:
+        """Wait for a free fetch slot within the concurrency limit and rate budget.
+
+        Without rate_limited, only the concurrency limit applies. This is used for the first refreshes at startup,
+        so many stations do not wait for each other one after another.
+        """
+        async with self._semaphore:
+            if rate_limited:
+                now = asyncio.get_running_loop().time()
+                wait = self._next_request_at - now
+                self._next_request_at = (
+                    max(now, self._next_request_at) + self._request_spacing
+                )
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
@@ -1,40 +1,39 @@
 """Sensor platform for BSH Tides for Germany."""
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 import logging
 
-import dateutil.parser
-
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorStateClass,
     # SensorEntityDescription,
 )
-from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
-from homeassistant.const import UnitOfLength
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfInformation, UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import DOMAIN, TideEvent
 from .coordinator import BshTidesCoordinator
+from .entity import BshEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# The current water level is interpolated from the parsed forecast, so updating it does not fetch anything
+CURRENT_LEVEL_UPDATE_INTERVAL = timedelta(minutes=1)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ):
+    # The forecast was already loaded in async_setup_entry of the integration
     coordinator: BshTidesCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        raise ConfigEntryNotReady(f"BSH Tides update failed: {err}") from err
-
     entities = [
         BshTideEventTimeSensor(coordinator),
         BshTideEventTimeSensor(coordinator, TideEvent.HIGH),
@@ -43,20 +42,28 @@ async def async_setup_entry(
         BshTideLevelSensor(coordinator),
         BshTideLevelSensor(coordinator, TideEvent.HIGH),
         BshTideLevelSensor(coordinator, TideEvent.LOW),
+        BshCurrentTideLevelSensor(coordinator),
         BshTideDiffSensor(coordinator),
         BshTideDiffSensor(coordinator, TideEvent.HIGH),
         BshTideDiffSensor(coordinator, TideEvent.LOW),
         BshMeanWaterLevelSensor(coordinator, TideEvent.HIGH),
         BshMeanWaterLevelSensor(coordinator, TideEvent.LOW),
         BshForecastCreatedSensor(coordinator),
+        BshRefreshesSensor(coordinator),
         BshStationAreaSensor(coordinator),
         BshForecastTypeSensor(coordinator),
+        BshTelemetrySensor(coordinator, "fetch_latency"),
+        BshTelemetrySensor(coordinator, "payload_size"),
+        BshTelemetrySensor(coordinator, "decode_time"),
+        BshTelemetrySensor(coordinator, "parse_time"),
+        BshConsecutiveFailuresSensor(coordinator),
+        BshLastSuccessSensor(coordinator),
     ]
 
     async_add_entities(entities)
 
 
-class BshBaseSensor(CoordinatorEntity, SensorEntity):
+class BshBaseSensor(BshEntity, SensorEntity):
     """Base sensor class for BSH Tides integration.
 
     This class provides common functionality and attributes for all BSH Tides sensors.
@@ -64,25 +71,36 @@ class BshBaseSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(self, coordinator: BshTidesCoordinator):
         super().__init__(coordinator)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, coordinator.bshnr)},
-            "name": f"BSH {coordinator.station_name}",
-            "manufacturer": "BSH",
-            "entry_type": "service",
-        }
-        self._attr_attribution = coordinator.data.get(
-            "copyright_note",
-            "© BSH – Bundesamt für Seeschifffahrt und Hydrographie",
-        )
-
-        # The _attr_has_entity_name is decisive for having nicely combined entity names like "sensor.bsh_eider_sperrwerk_aussenpegel_mean_high_water_level"
-        # instead of just sensor.mean_high_water_level which would be ambiguous for multiple entities.
-        self._attr_has_entity_name = True
+        # What was written by the last async_write_ha_state(), see _handle_coordinator_update
+        self._last_written: tuple | None = None
         _LOGGER.debug("Initialized sensor with seo_id=%s", coordinator.seo_id)
 
-    @property
-    def unique_id(self):
-        return f"bsh_{self.coordinator.seo_id}_{self._attr_translation_key}"
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed since the last write.
+
+        Most sensors, e.g. the mean water levels or the station area, stay the same across refreshes. Skipping
+        their writes saves recorder rows and state_changed events.
+        """
+        if not self._async_write_if_changed():
+            self.coordinator.suppressed_writes += 1
+
+    @callback
+    def _async_write_if_changed(self) -> bool:
+        """Write the state if it changed since the last write, return if it was written."""
+        if self._state_snapshot() == self._last_written:
+            return False
+        self.async_write_ha_state()
+        return True
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._last_written = self._state_snapshot()
+        super().async_write_ha_state()
+
+    def _state_snapshot(self) -> tuple:
+        """Return everything that ends up in the written state."""
+        return (self.available, self.native_value, self.extra_state_attributes)
 
     @staticmethod
     def get_event_prefix(event: TideEvent = None) -> str:
@@ -93,7 +111,29 @@ class BshBaseSensor(CoordinatorEntity, SensorEntity):
         return ""
 
 
-class BshTideEventTimeSensor(BshBaseSensor):
+class BshNextEventSensor(BshBaseSensor):
+    """Base class of the sensors of the next/high/low event.
+
+    The event may be predicted locally instead of being part of the BSH forecast, see the predicted attribute.
+    """
+
+    _event: TideEvent | None = None
+
+    @property
+    def available(self) -> bool:
+        # the forecast covers the next days, so it stays available while the refreshes fail
+        return self.coordinator.next_events.get(self._event) is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool] | None:
+        """Mark values of locally predicted tides, e.g. during a BSH outage."""
+        item = self.coordinator.next_events.get(self._event)
+        if item is None:
+            return None
+        return {"predicted": item.predicted}
+
+
+class BshTideEventTimeSensor(BshNextEventSensor):
     """Sensor for tide event time for the next/high/low event."""
 
     _attr_device_class = SensorDeviceClass.TIMESTAMP
@@ -107,20 +147,16 @@ class BshTideEventTimeSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        now = datetime.now(UTC)
-        for item in self.coordinator.forecast_data:
-            ts = dateutil.parser.parse(item["timestamp"])
-            if ts > now and (
-                self._event is None or item.get("event") == self._event.value
-            ):
-                _LOGGER.debug(
-                    "%s: Tide time (%s) is %s", self.unique_id, self._event, ts
-                )
-                return ts
-        return None
+        item = self.coordinator.next_events.get(self._event)
+        if item is None:
+            return None
+        _LOGGER.debug(
+            "%s: Tide time (%s) is %s", self.unique_id, self._event, item.time
+        )
+        return item.time
 
 
-class BshTideLevelSensor(BshBaseSensor):
+class BshTideLevelSensor(BshNextEventSensor):
     """Sensor for the tide level (cm) for the next/high/low event."""
 
     _attr_device_class = SensorDeviceClass.DISTANCE
@@ -135,34 +171,56 @@ class BshTideLevelSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> int | None:
-        now = datetime.now(UTC)
-        for item in self.coordinator.forecast_data:
-            ts = dateutil.parser.parse(item["timestamp"])
-            if ts > now and (
-                self._event is None or item.get("event") == self._event.value
-            ):
-                value = item.get("value")
-                try:
-                    level = round(float(value)) if value not in (None, "") else None
-                    _LOGGER.debug(
-                        "%s: Tide level (%s) is %s cm",
-                        self.unique_id,
-                        self._event,
-                        level,
-                    )
-                    return level
-                except (TypeError, ValueError):
-                    _LOGGER.debug(
-                        "%s: Invalid tide level (%s): %s",
-                        self.unique_id,
-                        self._event,
-                        value,
-                    )
-                    return None
-        return None
+        item = self.coordinator.next_events.get(self._event)
+        if item is None:
+            return None
+        _LOGGER.debug(
+            "%s: Tide level (%s) is %s cm", self.unique_id, self._event, item.level
+        )
+        return item.level
+
 
+class BshCurrentTideLevelSensor(BshBaseSensor):
+    """Sensor for the expected current water level (cm), interpolated from the forecast."""
 
-class BshTideDiffSensor(BshBaseSensor):
+    _attr_device_class = SensorDeviceClass.DISTANCE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfLength.CENTIMETERS
+    _attr_icon = "mdi:waves-arrow-up"
+    _attr_translation_key = "current_tide_level"
+
+    def __init__(self, coordinator: BshTidesCoordinator):
+        super().__init__(coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_update_level, CURRENT_LEVEL_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_update_level(self, _now: datetime) -> None:
+        # The level is rounded to cm, so it does not change every minute around high and low tide.
+        # These ticks were never written unconditionally, so they do not count as suppressed writes.
+        self._async_write_if_changed()
+
+    @property
+    def available(self) -> bool:
+        # stays available while the refreshes fail, as long as the forecast covers the current time
+        return self.coordinator.level_model.level(datetime.now(UTC)) is not None
+
+    @property
+    def native_value(self) -> int | None:
+        level = self.coordinator.level_model.level(datetime.now(UTC))
+        if level is None:
+            return None
+        _LOGGER.debug("%s: Current tide level is %.1f cm", self.unique_id, level)
+        return round(level)
+
+
+class BshTideDiffSensor(BshNextEventSensor):
     """Sensor for the tide difference (cm) to mean water level for the next/high/low event."""
 
     _attr_native_unit_of_measurement = UnitOfLength.CENTIMETERS
@@ -176,27 +234,16 @@ class BshTideDiffSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> int | None:
-        now = datetime.now(UTC)
-        for item in self.coordinator.forecast_data:
-            ts = dateutil.parser.parse(item["timestamp"])
-            if (
-                self._event is None or item.get("event") == self._event.value
-            ) and ts > now:
-                try:
-                    value = int(item["forecast"])
-                    _LOGGER.debug(
-                        "%s: Tide diff (%s) is %s m", self.unique_id, self._event, value
-                    )
-                    return value
-                except Exception as e:
-                    _LOGGER.debug(
-                        "%s: Failed to parse tide diff: %s", self.unique_id, e
-                    )
-                    return None
-        return None
+        item = self.coordinator.next_events.get(self._event)
+        if item is None:
+            return None
+        _LOGGER.debug(
+            "%s: Tide diff (%s) is %s cm", self.unique_id, self._event, item.forecast
+        )
+        return item.forecast
 
 
-class BshNextTideEventSensor(BshBaseSensor):
+class BshNextTideEventSensor(BshNextEventSensor):
     """Sensor for the next tide event (specifies: 'high_tide' or 'low_tide')."""
 
     _attr_icon = "mdi:arrow-split-horizontal"
@@ -209,15 +256,12 @@ class BshNextTideEventSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> str | None:
-        now = datetime.now(UTC)
-        for item in self.coordinator.forecast_data:
-            ts = dateutil.parser.parse(item["timestamp"])
-            if ts > now:
-                event = item.get("event")
-                if event == TideEvent.HIGH.value:
-                    return "high_tide"
-                if event == TideEvent.LOW.value:
-                    return "low_tide"
+        item = self.coordinator.next_events.next
+        event = item.event if item else None
+        if event == TideEvent.HIGH.value:
+            return "high_tide"
+        if event == TideEvent.LOW.value:
+            return "low_tide"
         return None
 
 
@@ -268,12 +312,41 @@ class BshForecastCreatedSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> datetime | None:
-        val = self.coordinator.data.get("creation_forecast")
-        value = dateutil.parser.parse(val) if val else None
+        value = self.coordinator.forecast_created
         _LOGGER.debug("%s: Forecast was created at %s", self.unique_id, value)
         return value
 
 
+class BshRefreshesSensor(BshBaseSensor):
+    """Number of refreshes of the station whose forecast was parsed.
+
+    Also exposes how many refreshes were skipped because the forecast did not change, and how many state writes
+    of the sensors of the station were suppressed because their state did not change. These counters change on
+    every refresh, so they have their own diagnostic sensor, disabled by default.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:counter"
+    _attr_translation_key = "full_refreshes"
+    _unrecorded_attributes = frozenset({"skipped_refreshes", "suppressed_writes"})
+
+    def __init__(self, coordinator: BshTidesCoordinator):
+        super().__init__(coordinator)
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.full_refreshes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        return {
+            "skipped_refreshes": self.coordinator.skipped_refreshes,
+            "suppressed_writes": self.coordinator.suppressed_writes,
+        }
+
+
 class BshStationAreaSensor(BshBaseSensor):
     """Contains the area of the station, e.g. Elbe for St. Pauli."""
 
@@ -307,9 +380,90 @@ class BshForecastTypeSensor(BshBaseSensor):
 
     @property
     def native_value(self) -> str | None:
-        if "hwnw_forecast" in self.coordinator.data:
-            value = "peak_value_forecast"
-        else:
-            value = "curve_forecast"
+        value = self.coordinator.forecast_type
         _LOGGER.debug("%s: Station forecast type is %s", self.unique_id, value)
         return value
+
+
+class BshTelemetrySensor(BshBaseSensor):
+    """Last value of a fetch or parse metric of the station, with percentiles over the recent refreshes.
+
+    The metric is the name of a RollingStats of StationTelemetry, e.g. fetch_latency or payload_size.
+    Disabled by default, these sensors are meant to spot slow stations and regressions.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, coordinator: BshTidesCoordinator, metric: str):
+        super().__init__(coordinator)
+        self._attr_translation_key = metric
+        self._metric = metric
+        if metric == "payload_size":
+            self._attr_device_class = SensorDeviceClass.DATA_SIZE
+            self._attr_native_unit_of_measurement = UnitOfInformation.BYTES
+            self._attr_icon = "mdi:download"
+        else:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def _stats(self):
+        return getattr(self.coordinator.telemetry, self._metric)
+
+    @property
+    def native_value(self) -> float | None:
+        value = self._stats.last
+        return round(value, 1) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int | None]:
+        """Expose the rolling percentiles of the metric."""
+        return {
+            key: round(value, 1) if isinstance(value, float) else value
+            for key, value in self._stats.summary().items()
+        }
+
+
+class BshConsecutiveFailuresSensor(BshBaseSensor):
+    """Number of refreshes of the station that failed in a row, 0 after a successful one."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_translation_key = "consecutive_failures"
+
+    def __init__(self, coordinator: BshTidesCoordinator):
+        super().__init__(coordinator)
+
+    @property
+    def available(self) -> bool:
+        # stays available when the refreshes fail, that is what it counts
+        return True
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.telemetry.consecutive_failures
+
+
+class BshLastSuccessSensor(BshBaseSensor):
+    """Time of the last successful fetch of the station in UTC."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_translation_key = "last_success"
+
+    def __init__(self, coordinator: BshTidesCoordinator):
+        super().__init__(coordinator)
+
+    @property
+    def available(self) -> bool:
+        # stays available when the refreshes fail, to show since when
+        return True
+
+    @property
+    def native_value(self) -> datetime | None:
+        return self.coordinator.telemetry.last_success
@@ -0,0 +1,113 @@
+"""Services of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import partial
+import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_DURATION,
+    ATTR_END,
+    ATTR_EVENT,
+    ATTR_LIMIT,
+    ATTR_START,
+    ATTR_STATION,
+    DOMAIN,
+    SERVICE_GET_TIDES,
+    TideEvent,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import BshTidesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+GET_TIDES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_STATION): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Exclusive(ATTR_END, "end"): cv.datetime,
+        vol.Exclusive(ATTR_DURATION, "end"): cv.positive_time_period,
+        vol.Optional(ATTR_EVENT): vol.In([event.value for event in TideEvent]),
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TIDES,
+        partial(_async_get_tides, hass),
+        schema=GET_TIDES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _coordinators(hass: HomeAssistant) -> dict[str, BshTidesCoordinator]:
+    """Return the coordinators of all configured stations by bshnr."""
+    return {
+        coordinator.bshnr: coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+    }
+
+
+async def _async_get_tides(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the high and low tides of one, several or all stations within a time window.
+
+    The window starts at start (default: now) and ends at end, after duration or with the forecast. The events
+    are looked up in the sorted index of each station. With a limit, at most that many events are returned per
+    station, and next_start is the time to continue from, i.e. the start of the next page.
+    """
+    coordinators = _coordinators(hass)
+    stations = call.data.get(ATTR_STATION, list(coordinators))
+    if unknown := [bshnr for bshnr in stations if bshnr not in coordinators]:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unknown_station",
+            translation_placeholders={"station": ", ".join(unknown)},
+        )
+    start = dt_util.as_utc(call.data.get(ATTR_START) or dt_util.utcnow())
+    end: datetime | None = None
+    if ATTR_END in call.data:
+        end = dt_util.as_utc(call.data[ATTR_END])
+    elif ATTR_DURATION in call.data:
+        end = start + call.data[ATTR_DURATION]
+    event = TideEvent(call.data[ATTR_EVENT]) if ATTR_EVENT in call.data else None
+    limit: int | None = call.data.get(ATTR_LIMIT)
+
+    response = {}
+    for bshnr in stations:
+        coordinator = coordinators[bshnr]
+        # one event more than asked for tells where the next page starts
+        events = coordinator.index.between(
+            start, end, event, limit + 1 if limit else None
+        )
+        next_start = None
+        if limit and len(events) > limit:
+            next_start = events[limit].time.isoformat()
+            events = events[:limit]
+        response[bshnr] = {
+            "name": coordinator.station_name,
+            "events": [item.as_dict() for item in events],
+            "next_start": next_start,
+        }
+    _LOGGER.debug("Returning tides of %s from %s to %s", stations, start, end)
+    return {"stations": response}
@@ -0,0 +1,110 @@
+"""Forecast water levels as long-term statistics of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfLength
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import DistanceConverter
+
+from .const import DOMAIN
+from .interpolation import TideLevelModel
+
+_LOGGER = logging.getLogger(__name__)
+
+# Long-term statistics have a resolution of one hour, the level is sampled in this step within the hour
+STATISTICS_PERIOD = timedelta(hours=1)
+SAMPLE_STEP = timedelta(minutes=10)
+
+
+def statistic_id(bshnr: str) -> str:
+    """Return the id of the forecast level statistic of a station, e.g. bsh_tides:forecast_level_dova."""
+    return f"{DOMAIN}:forecast_level_{slugify(bshnr)}"
+
+
+def hourly_levels(
+    level_model: TideLevelModel,
+) -> dict[datetime, tuple[float, float, float]]:
+    """Return the mean, min and max level (cm) of every full hour within the model, keyed by start of the hour."""
+    if (span := level_model.span) is None:
+        return {}
+    first, last = span
+    hour = first.replace(minute=0, second=0, microsecond=0)
+    if hour < first:
+        hour += STATISTICS_PERIOD
+    samples = int(STATISTICS_PERIOD / SAMPLE_STEP)
+    rows: dict[datetime, tuple[float, float, float]] = {}
+    while hour + STATISTICS_PERIOD <= last:
+        levels = [level_model.level(hour + SAMPLE_STEP * i) for i in range(samples)]
+        levels = [level for level in levels if level is not None]
+        if levels:
+            rows[hour] = (
+                round(sum(levels) / len(levels), 1),
+                round(min(levels), 1),
+                round(max(levels), 1),
+            )
+        hour += STATISTICS_PERIOD
+    return rows
+
+
+class ForecastStatistics:
+    """Pushes the forecast water level of a station into the external statistics of the recorder.
+
+    Every refresh the level model of the forecast is reduced to hourly mean, min and max. Only the hours which
+    are new or changed since the last push are sent, in one batch. Dashboards can then chart the forecast
+    from the statistics instead of scanning the state history of the sensors.
+    """
+
+    def __init__(self, hass: HomeAssistant, bshnr: str):
+        self.hass = hass
+        self.statistic_id = statistic_id(bshnr)
+        # The rows sent by the last push
+        self._sent: dict[datetime, tuple[float, float, float]] = {}
+
+    @callback
+    def async_push(self, level_model: TideLevelModel, name: str) -> int:
+        """Send the changed hours of the forecast, return their number.
+
+        Does nothing if the recorder is not loaded.
+        """
+        if "recorder" not in self.hass.config.components:
+            return 0
+        rows = hourly_levels(level_model)
+        changed = sorted(
+            start for start, values in rows.items() if self._sent.get(start) != values
+        )
+        self._sent = rows
+        if not changed:
+            return 0
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{name} forecast level",
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_class=DistanceConverter.UNIT_CLASS,
+            unit_of_measurement=UnitOfLength.CENTIMETERS,
+        )
+        async_add_external_statistics(
+            self.hass,
+            metadata,
+            [
+                StatisticData(
+                    start=start, mean=rows[start][0], min=rows[start][1], max=rows[start][2]
+                )
+                for start in changed
+            ],
+        )
+        _LOGGER.debug(
+            "Pushed %s of %s forecast hours to %s", len(changed), len(rows), self.statistic_id
+        )
+        return len(changed)
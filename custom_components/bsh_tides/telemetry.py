@@ -0,0 +1,77 @@
+"""Fetch and parse telemetry of the BSH Tides for Germany integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import math
+import time
+
+# Number of samples the percentiles are computed from
+TELEMETRY_WINDOW = 50
+
+
+def elapsed_ms(start: float) -> float:
+    """Return the milliseconds since start, a time.perf_counter() value."""
+    return (time.perf_counter() - start) * 1000
+
+
+class RollingStats:
+    """The last samples of a metric, with percentiles over them."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, size: int = TELEMETRY_WINDOW):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+
+    @property
+    def last(self) -> float | None:
+        return self._samples[-1] if self._samples else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the percentile (nearest rank) of the samples, None without samples."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        rank = max(math.ceil(percent / 100 * len(samples)), 1)
+        return samples[rank - 1]
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return the median, 90th and 99th percentile, and the number of samples."""
+        return {
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "samples": len(self._samples),
+        }
+
+
+class StationTelemetry:
+    """Fetch and parse metrics of a station, recorded by BshApi and the coordinator.
+
+    - fetch_latency: Time until the response headers arrived in ms.
+    - payload_size: Size of the received body in bytes.
+    - decode_time: Time to read and decode the body in ms.
+    - parse_time: Time to parse the payload into events (incl. finding the extrema of the curve) in ms.
+    """
+
+    def __init__(self):
+        self.fetch_latency = RollingStats()
+        self.payload_size = RollingStats()
+        self.decode_time = RollingStats()
+        self.parse_time = RollingStats()
+        self.consecutive_failures = 0
+        self.last_success: datetime | None = None
+
+    def record_success(self, now: datetime) -> None:
+        self.consecutive_failures = 0
+        self.last_success = now
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.bsh_tides.coordinator import BshTidesCoordinator
+
+
+class DummyHass:
+    def __init__(self):
+        self.data = {}
+        self.bus = None
+        self.config = MagicMock(components=set())
+
+
+@pytest.fixture
+def coordinator():
+    """A coordinator without session and scheduler, for parsing payloads directly."""
+    return BshTidesCoordinator(hass=DummyHass(), bshnr="999X")
@@ -0,0 +1,98 @@
+"""Synthetic BSH payloads for the benchmarks, shaped like the responses of the station API."""
+
+from datetime import UTC, datetime, timedelta
+import json
+import math
+
+# Angular speed of the main lunar tide (M2) in degrees per hour
+M2_SPEED = 28.9841042
+CURVE_STEP = timedelta(minutes=10)
+MHW = 650
+MNW = 350
+
+
+def _level(time: datetime) -> float:
+    hours = time.timestamp() / 3600
+    return round(500 + 150 * math.cos(math.radians(M2_SPEED * hours)), 1)
+
+def _timestamp(time: datetime) -> str:
+    return time.astimezone(UTC).isoformat(sep=" ", timespec="seconds")
+
+def _start(start: datetime | None) -> datetime:
+    # the forecast starts a few hours ago, like the real curve which still contains the latest measurements
+    start = start or datetime.now(UTC) - timedelta(hours=6)
+    return start.replace(minute=0, second=0, microsecond=0)
+
+def _station(bshnr: str) -> dict:
+    return {
+        "station_name": f"Station {bshnr}",
+        "seo_id": f"station_{bshnr.lower()}",
+        "bshnr": bshnr,
+        "MHW": MHW,
+        "MNW": MNW,
+        "area": "Elbe",
+        "creation_forecast": _timestamp(datetime.now(UTC).replace(minute=0, second=0, microsecond=0)),
+        "copyright_note": "© BSH",
+    }
+
+def _curve(start: datetime, days: int) -> dict:
+    now = datetime.now(UTC)
+    data = []
+    for i in range(days * 144):
+        time = start + CURVE_STEP * i
+        past = time < now
+        data.append(
+            {
+                "timestamp": _timestamp(time),
+                "astro": round(_level(time) - 20, 1),
+                "curveforecast": _level(time),
+                "measurement": _level(time) if past else None,
+            }
+        )
+    return {"head": {"unit": "cm"}, "data": data}
+
+
+def hwnw_payload(days: int = 7, start: datetime | None = None, bshnr: str = "101P") -> dict:
+    """Return the payload of a station with high and low tide events and a curve of the same length."""
+    start = _start(start)
+    events = []
+    # high and low tides are about 6h12m apart
+    for i in range(round(days * 24 / 6.2)):
+        time = start + timedelta(hours=6, minutes=12) * i
+        high = i % 2 == 0
+        value = MHW + 10 if high else MNW - 10
+        events.append(
+            {
+                "timestamp": _timestamp(time),
+                "event": "HW" if high else "NW",
+                "value": value,
+                "forecast": "+0,1 m" if high else "-0,1 m",
+            }
+        )
+    return {
+        **_station(bshnr),
+        "hwnw_forecast": {"head": {"unit": "cm"}, "data": events},
+        "curve_forecast": _curve(start, days),
+    }
+
+def curve_payload(days: int = 7, start: datetime | None = None, bshnr: str = "201P") -> dict:
+    """Return the payload of a station with a curve forecast in 10 minute steps only."""
+    return {**_station(bshnr), "curve_forecast": _curve(_start(start), days)}
+
+def encode(payload: dict) -> bytes:
+    return json.dumps(payload).encode()
+
+
+class BytesReader:
+    """Serves a body in chunks like the content stream of an aiohttp response."""
+
+    def __init__(self, body: bytes, chunk_size: int = 64 * 1024):
+        self._body = body
+        self._chunk_size = chunk_size
+        self._pos = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        size = self._chunk_size if n < 0 else min(n, self._chunk_size)
+        chunk = self._body[self._pos : self._pos + size]
+        self._pos += len(chunk)
+        return chunk
@@ -0,0 +1,117 @@
+"""Benchmarks for decoding and parsing the payloads of hwnw and curve stations.
+
+Run with: pytest tests/benchmarks --benchmark-enable
+The results are saved to .benchmarks/, compare a run against the last saved one with
+--benchmark-compare --benchmark-compare-fail=mean:10%
+"""
+
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+
+from custom_components.bsh_tides.decoding import (
+    async_decode_station_stream,
+    json_loads,
+    missing_keys,
+    orjson,
+    streaming_available,
+)
+
+from .payloads import BytesReader, curve_payload, encode, hwnw_payload
+
+CURVE_DAYS = [1, 3, 7, 14]
+
+
+@pytest.fixture
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+# --- parse_forecast_value --- #
+
+@pytest.mark.benchmark(group="parse_forecast_value")
+def test_bench_parse_forecast_value(benchmark, coordinator):
+    values = ["+0,1 m", "-0,3 m", "+/-0,0 m", "+1,25 m", "", None] * 10
+
+    def parse():
+        return [coordinator.parse_forecast_value(value) for value in values]
+
+    assert benchmark(parse)[0] == 10
+
+
+# --- _parse_forecast_data --- #
+
+@pytest.mark.benchmark(group="parse_forecast_data")
+@pytest.mark.parametrize("days", [7, 14])
+def test_bench_parse_hwnw_forecast(benchmark, coordinator, days):
+    payload = hwnw_payload(days)
+    benchmark(coordinator._parse_forecast_data, payload)
+    assert coordinator.forecast_data
+
+@pytest.mark.benchmark(group="parse_forecast_data")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_parse_curve_forecast(benchmark, coordinator, days):
+    payload = curve_payload(days)
+    benchmark(coordinator._parse_forecast_data, payload)
+    assert coordinator.forecast_data
+
+
+# --- _find_curve_extrema --- #
+
+@pytest.mark.benchmark(group="find_curve_extrema")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_find_curve_extrema(benchmark, coordinator, days):
+    payload = curve_payload(days)
+    # about two high and two low tides per day
+    assert len(benchmark(coordinator._find_curve_extrema, payload)) >= 3 * days
+
+
+# --- decoding --- #
+
+def _peak_memory(func, *args) -> int:
+    """Return the peak of the memory allocated while running func once, in bytes."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_decode_json(benchmark, days):
+    body = encode(curve_payload(days))
+    benchmark.extra_info["peak_memory"] = _peak_memory(json.loads, body)
+    assert "curve_forecast" in benchmark(json.loads, body)
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_decode_orjson(benchmark, days):
+    if orjson is None:
+        pytest.skip("orjson is not installed")
+    body = encode(curve_payload(days))
+    benchmark.extra_info["peak_memory"] = _peak_memory(json_loads, body)
+    assert "curve_forecast" in benchmark(json_loads, body)
+
+@pytest.mark.benchmark(group="decode")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_decode_streaming(benchmark, event_loop_runner, days):
+    if not streaming_available():
+        pytest.skip("ijson is not installed")
+    body = encode(curve_payload(days))
+
+    def decode():
+        return event_loop_runner(async_decode_station_stream(BytesReader(body)))
+
+    benchmark.extra_info["peak_memory"] = _peak_memory(decode)
+    assert len(benchmark(decode)["curve_forecast"]["timestamps"]) == days * 144
+
+@pytest.mark.benchmark(group="decode_prefilter")
+@pytest.mark.parametrize("days", CURVE_DAYS)
+def test_bench_missing_keys(benchmark, days):
+    body = encode(curve_payload(days))
+    assert benchmark(missing_keys, body, ("station_name",)) == []
@@ -0,0 +1,108 @@
+"""Benchmarks for reading the next tide values from the forecast data.
+
+Run with: pytest tests/benchmarks --benchmark-enable
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import dateutil.parser
+import pytest
+
+from custom_components.bsh_tides.const import TideEvent
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+from custom_components.bsh_tides.sensor import (
+    BshCurrentTideLevelSensor,
+    BshForecastCreatedSensor,
+    BshForecastTypeSensor,
+    BshMeanWaterLevelSensor,
+    BshNextTideEventSensor,
+    BshStationAreaSensor,
+    BshTideDiffSensor,
+    BshTideEventTimeSensor,
+    BshTideLevelSensor,
+)
+
+from .payloads import curve_payload, hwnw_payload
+
+# One week of high and low tides, about 12h25m apart each
+EVENTS = 28
+
+
+class DummyCoordinator:
+    def __init__(self, forecast_data):
+        self.bshnr = "123P"
+        self.seo_id = "dummy_station"
+        self.station_name = "Dummy Station"
+        self.data = {"station_name": self.station_name}
+        self.forecast_data = [
+            ForecastEvent.create(item["time"], item["event"], item["value"], item["forecast"])
+            for item in forecast_data
+        ]
+        self.next_events = ForecastIndex(self.forecast_data).snapshot(datetime.now(UTC))
+
+
+@pytest.fixture
+def forecast_data():
+    # the first half of the events is already in the past, like in a real forecast
+    start = datetime.now(UTC) - timedelta(days=3)
+    data = []
+    for i in range(EVENTS):
+        ts = start + timedelta(hours=6, minutes=12) * i
+        data.append(
+            {
+                "timestamp": ts.isoformat(sep=" ", timespec="seconds"),
+                "time": ts,
+                "value": 170 if i % 2 else 30,
+                "forecast": 10,
+                "event": TideEvent.HIGH.value if i % 2 else TideEvent.LOW.value,
+            }
+        )
+    return data
+
+
+def _next_time_parsing_every_read(forecast_data, event: TideEvent):
+    """The previous implementation, which parsed every timestamp on each state read."""
+    now = datetime.now(UTC)
+    for item in forecast_data:
+        ts = dateutil.parser.parse(item["timestamp"])
+        if ts > now and item.get("event") == event.value:
+            return ts
+    return None
+
+
+@pytest.mark.benchmark(group="next_tide_time")
+def test_bench_next_tide_time_parsing_every_read(benchmark, forecast_data):
+    assert benchmark(_next_time_parsing_every_read, forecast_data, TideEvent.HIGH)
+
+
+@pytest.mark.benchmark(group="next_tide_time")
+def test_bench_next_tide_time_pre_parsed(benchmark, forecast_data):
+    sensor = BshTideEventTimeSensor(DummyCoordinator(forecast_data), TideEvent.HIGH)
+    assert benchmark(lambda: sensor.native_value)
+
+
+# --- every sensor of a station with a parsed forecast --- #
+
+SENSORS = {
+    "next_tide_time": lambda c: BshTideEventTimeSensor(c),
+    "next_high_tide_time": lambda c: BshTideEventTimeSensor(c, TideEvent.HIGH),
+    "next_tide_event": BshNextTideEventSensor,
+    "next_tide_level": lambda c: BshTideLevelSensor(c),
+    "next_low_tide_level": lambda c: BshTideLevelSensor(c, TideEvent.LOW),
+    "current_tide_level": BshCurrentTideLevelSensor,
+    "next_tide_diff": lambda c: BshTideDiffSensor(c),
+    "mean_high_water_level": lambda c: BshMeanWaterLevelSensor(c, TideEvent.HIGH),
+    "forecast_created_at": BshForecastCreatedSensor,
+    "station_area": BshStationAreaSensor,
+    "forecast_type": BshForecastTypeSensor,
+}
+
+
+@pytest.mark.benchmark(group="native_value")
+@pytest.mark.parametrize("payload", [hwnw_payload, curve_payload], ids=["hwnw", "curve"])
+@pytest.mark.parametrize("sensor", SENSORS.values(), ids=SENSORS.keys())
+def test_bench_native_value(benchmark, coordinator, payload, sensor):
+    coordinator.data = payload(7)
+    coordinator._parse_forecast_data(coordinator.data)
+    sensor = sensor(coordinator)
+    assert benchmark(lambda: sensor.native_value) is not None
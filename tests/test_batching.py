@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import pytest
+
+from custom_components.bsh_tides.batching import BshJobBatcher
+
+
+class DummyHass:
+    """Dummy hass with an executor, counting the executor jobs."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.executor_jobs = 0
+
+    def async_add_executor_job(self, target, *args):
+        self.executor_jobs += 1
+        return self.loop.run_in_executor(None, target, *args)
+
+    def async_create_background_task(self, target, name):
+        return asyncio.create_task(target, name=name)
+
+
+def _job(value):
+    def job():
+        return value, threading.current_thread() is threading.main_thread()
+    return job
+
+
+@pytest.mark.asyncio
+async def test_small_jobs_run_inline():
+    hass = DummyHass()
+    batcher = BshJobBatcher(hass, inline_threshold=100)
+    assert await batcher.async_run(_job(1), size=99) == (1, True)
+    assert hass.executor_jobs == 0
+
+@pytest.mark.asyncio
+async def test_jobs_are_batched():
+    hass = DummyHass()
+    batcher = BshJobBatcher(hass, inline_threshold=100, delay=0.01)
+    results = await asyncio.gather(*(batcher.async_run(_job(i), size=100) for i in range(5)))
+    assert results == [(i, False) for i in range(5)]
+    assert hass.executor_jobs == 1
+
+    # later jobs go into the next batch
+    assert await batcher.async_run(_job(5), size=1000) == (5, False)
+    assert hass.executor_jobs == 2
+
+@pytest.mark.asyncio
+async def test_failing_job_does_not_fail_the_batch():
+    hass = DummyHass()
+    batcher = BshJobBatcher(hass, inline_threshold=0, delay=0.01)
+
+    def fail():
+        raise ValueError("invalid payload")
+
+    results = await asyncio.gather(
+        batcher.async_run(_job(1), size=1), batcher.async_run(fail, size=1), return_exceptions=True
+    )
+    assert results[0] == (1, False)
+    assert isinstance(results[1], ValueError)
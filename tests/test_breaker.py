@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+
+from custom_components.bsh_tides import breaker as breaker_module
+from custom_components.bsh_tides.breaker import CLOSED, HALF_OPEN, OPEN, BshCircuitBreaker
+from custom_components.bsh_tides.exceptions import BshCannotConnect, BshCircuitOpen, BshInvalidStation
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock which only moves when the test says so, and no random jitter."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(breaker_module.random, "uniform", lambda a, b: b)
+    return now
+
+
+def _request(breaker, error=None):
+    with breaker.guard():
+        if error:
+            raise error
+
+def _fail(breaker):
+    with pytest.raises(BshCannotConnect):
+        _request(breaker, BshCannotConnect("down"))
+
+
+def test_opens_after_repeated_failures(clock):
+    breaker = BshCircuitBreaker(failure_threshold=3, base_backoff=30)
+    _fail(breaker)
+    _fail(breaker)
+    _request(breaker)  # a success resets the count
+    _fail(breaker)
+    _fail(breaker)
+    assert breaker.state == CLOSED
+    _fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.retry_in == 30
+
+    # requests are skipped while open
+    with pytest.raises(BshCircuitOpen):
+        _request(breaker)
+
+def test_half_open_probe(clock):
+    breaker = BshCircuitBreaker(failure_threshold=1, base_backoff=30, max_backoff=100)
+    _fail(breaker)
+    clock[0] += 30
+    with breaker.guard():
+        assert breaker.state == HALF_OPEN
+        # only a single probe at a time
+        with pytest.raises(BshCircuitOpen):
+            _request(breaker)
+    assert breaker.state == CLOSED
+
+def test_failed_probe_doubles_backoff(clock):
+    breaker = BshCircuitBreaker(failure_threshold=1, base_backoff=30, max_backoff=100)
+    _fail(breaker)
+    for backoff in (60, 100, 100):
+        clock[0] += breaker.retry_in
+        _fail(breaker)
+        assert breaker.state == OPEN
+        assert breaker.retry_in == backoff
+
+def test_other_errors_count_as_success(clock):
+    breaker = BshCircuitBreaker(failure_threshold=1, base_backoff=30)
+    _fail(breaker)
+    clock[0] += 30
+    # the host answered, just not with a valid station
+    with pytest.raises(BshInvalidStation):
+        _request(breaker, BshInvalidStation("invalid"))
+    assert breaker.state == CLOSED
+
+def test_cancelled_probe_allows_next_probe(clock):
+    breaker = BshCircuitBreaker(failure_threshold=1, base_backoff=30)
+    _fail(breaker)
+    clock[0] += 30
+    with pytest.raises(asyncio.CancelledError):
+        _request(breaker, asyncio.CancelledError())
+    _request(breaker)
+    assert breaker.state == CLOSED
+
+def test_failures_while_open_do_not_extend_backoff(clock):
+    breaker = BshCircuitBreaker(failure_threshold=1, base_backoff=30)
+    with pytest.raises(BshCannotConnect):
+        with breaker.guard():
+            # another request fails and opens the circuit while this one is running
+            _fail(breaker)
+            raise BshCannotConnect("down")
+    assert breaker.retry_in == 30
@@ -0,0 +1,219 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+
+from custom_components.bsh_tides import bsh_api as bsh_api_module
+from custom_components.bsh_tides.breaker import OPEN, BshCircuitBreaker
+from custom_components.bsh_tides.bsh_api import (
+    BshApi,
+    async_close_session,
+    async_get_session,
+)
+from custom_components.bsh_tides.const import DATA_SESSION
+from custom_components.bsh_tides.exceptions import BshCannotConnect, BshCircuitOpen, BshInvalidStation
+from custom_components.bsh_tides.telemetry import StationTelemetry
+
+
+@pytest.fixture
+def dummy_hass():
+    """Dummy Home Assistant instance with an event bus."""
+    class DummyHass:
+        def __init__(self):
+            self.data = {}
+            self.bus = MagicMock()
+
+    return DummyHass()
+
+
+# --- Tests: shared session --- #
+
+@pytest.mark.asyncio
+async def test_session_is_shared(dummy_hass):
+    session = async_get_session(dummy_hass)
+    assert async_get_session(dummy_hass) is session
+    assert dummy_hass.data[DATA_SESSION] is session
+    await async_close_session(dummy_hass)
+
+@pytest.mark.asyncio
+async def test_close_session(dummy_hass):
+    session = async_get_session(dummy_hass)
+    await async_close_session(dummy_hass)
+    assert session.closed
+    assert DATA_SESSION not in dummy_hass.data
+    # a new session is created on the next use
+    assert async_get_session(dummy_hass) is not session
+    await async_close_session(dummy_hass)
+
+def test_api_uses_injected_session():
+    session = MagicMock()
+    api = BshApi("123P", session)
+    assert api._session is session
+
+
+# --- Tests: conditional requests --- #
+
+def _mock_session(status=200, body=b"", headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.read = AsyncMock(return_value=body)
+    response.raise_for_status = MagicMock()
+    request = MagicMock()
+    request.__aenter__ = AsyncMock(return_value=response)
+    request.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=request)
+    return session
+
+@pytest.mark.asyncio
+async def test_fetch_sends_validators():
+    body = b'{"station_name": "Dummy Station"}'
+    session = _mock_session(body=body, headers={"ETag": '"abc"', "Last-Modified": "Sun, 13 Jul 2025 06:00:00 GMT"})
+    api = BshApi("123P", session)
+
+    assert await api.async_fetch_data() == {"station_name": "Dummy Station"}
+    assert session.get.call_args.kwargs["headers"] == {}
+
+    # the same body again is reported as unchanged
+    assert await api.async_fetch_data(conditional=True) is None
+    assert session.get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Sun, 13 Jul 2025 06:00:00 GMT",
+    }
+
+@pytest.mark.asyncio
+async def test_fetch_records_telemetry():
+    body = b'{"station_name": "Dummy Station"}'
+    telemetry = StationTelemetry()
+    api = BshApi("123P", _mock_session(body=body), telemetry=telemetry)
+
+    await api.async_fetch_data()
+    assert telemetry.fetch_latency.last >= 0
+    assert telemetry.payload_size.last == len(body)
+    assert len(telemetry.decode_time) == 1
+
+    # an unchanged payload is not decoded
+    await api.async_fetch_data(conditional=True)
+    assert len(telemetry.fetch_latency) == 2
+    assert len(telemetry.payload_size) == 2
+    assert len(telemetry.decode_time) == 1
+
+@pytest.mark.asyncio
+async def test_fetch_rejects_payload_without_station(monkeypatch):
+    decode = MagicMock()
+    monkeypatch.setattr(bsh_api_module, "json_loads", decode)
+    api = BshApi("123P", _mock_session(body=b'{"gauges": []}'))
+    with pytest.raises(BshInvalidStation):
+        await api.async_fetch_data()
+    # rejected before decoding
+    decode.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_fetch_station_list():
+    body = b'{"gauges": [{"bshnr": "123P", "station_name": "Dummy Station", "area": "Elbe"}]}'
+    assert await BshApi.fetch_station_list(_mock_session(body=body)) == [("123P", "Dummy Station", "Elbe")]
+    with pytest.raises(BshInvalidStation):
+        await BshApi.fetch_station_list(_mock_session(body=b'{"station_name": "Dummy Station"}'))
+
+@pytest.mark.asyncio
+async def test_fetch_not_modified():
+    api = BshApi("123P", _mock_session(status=304))
+    assert await api.async_fetch_data(conditional=True) is None
+
+@pytest.mark.asyncio
+async def test_fetch_after_reset_validators():
+    body = b'{"station_name": "Dummy Station"}'
+    api = BshApi("123P", _mock_session(body=body))
+    await api.async_fetch_data()
+    api.reset_validators()
+    assert await api.async_fetch_data(conditional=True) == {"station_name": "Dummy Station"}
+
+@pytest.mark.asyncio
+async def test_fetch_streaming():
+    pytest.importorskip("ijson")
+    body = b'{"station_name": "Dummy Station", "curve_forecast": {"data": [{"timestamp": "2025-07-13 14:30:00+02:00", "astro": 475, "curveforecast": 415}]}}'
+    session = _mock_session(body=body)
+    response = session.get.return_value.__aenter__.return_value
+    stream = [body]
+
+    async def read(n=-1):
+        return stream.pop() if stream and n != 0 else b""
+
+    response.content = MagicMock()
+    response.content.read = read
+    api = BshApi("123P", session, streaming=True)
+
+    assert await api.async_fetch_data() == {
+        "station_name": "Dummy Station",
+        "curve_forecast": {"timestamps": ["2025-07-13 14:30:00+02:00"], "values": [415]},
+    }
+    response.read.assert_not_awaited()
+
+
+# --- Tests: errors and circuit breaker --- #
+
+def _error_session(error):
+    session = _mock_session()
+    session.get.return_value.__aenter__ = AsyncMock(side_effect=error)
+    return session
+
+def _response_error(status):
+    return aiohttp.ClientResponseError(MagicMock(), (), status=status)
+
+@pytest.mark.asyncio
+async def test_fetch_unknown_station():
+    api = BshApi("123P", _error_session(_response_error(404)))
+    with pytest.raises(BshInvalidStation):
+        await api.async_fetch_data()
+
+@pytest.mark.asyncio
+async def test_fetch_timeout():
+    api = BshApi("123P", _error_session(TimeoutError()))
+    with pytest.raises(BshCannotConnect):
+        await api.async_fetch_data()
+
+@pytest.mark.asyncio
+async def test_fetch_station_list_timeout():
+    with pytest.raises(BshCannotConnect):
+        await BshApi.fetch_station_list(_error_session(TimeoutError()))
+
+@pytest.mark.asyncio
+async def test_fetch_skipped_while_circuit_open():
+    breaker = BshCircuitBreaker(failure_threshold=2)
+    session = _error_session(_response_error(503))
+    apis = [BshApi("123P", session, breaker=breaker), BshApi("456P", session, breaker=breaker)]
+    for api in apis:
+        with pytest.raises(BshCannotConnect):
+            await api.async_fetch_data()
+    assert breaker.state == OPEN
+
+    # no requests are sent for any station while the circuit is open
+    for api in apis:
+        with pytest.raises(BshCircuitOpen):
+            await api.async_fetch_data()
+    assert session.get.call_count == 2
+
+
+# --- Tests: request coalescing --- #
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_coalesced():
+    body = b'{"station_name": "Dummy Station"}'
+    session = _mock_session(body=body)
+    response = session.get.return_value.__aenter__.return_value
+
+    async def slow_read():
+        await asyncio.sleep(0.01)
+        return body
+
+    response.read = slow_read
+    first, second = BshApi("123P", session), BshApi("123P", session)
+    results = await asyncio.gather(first.async_fetch_data(), second.async_fetch_data())
+    assert results == [{"station_name": "Dummy Station"}] * 2
+    assert session.get.call_count == 1
+
+    # other stations and finished requests are not coalesced
+    await asyncio.gather(first.async_fetch_data(), BshApi("456P", session).async_fetch_data())
+    assert session.get.call_count == 3
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime, timedelta
+
+from custom_components.bsh_tides.cadence import PublicationCadence
+
+MIN_INTERVAL = timedelta(minutes=10)
+MAX_INTERVAL = timedelta(minutes=120)
+
+
+def _cadence(*published: datetime) -> PublicationCadence:
+    cadence = PublicationCadence(MIN_INTERVAL, MAX_INTERVAL)
+    for ts in published:
+        cadence.add(ts)
+    return cadence
+
+
+def test_no_history_uses_upper_bound():
+    cadence = _cadence()
+    assert cadence.next_interval(datetime(2025, 7, 13, 3, 0, tzinfo=UTC)) == MAX_INTERVAL
+
+def test_slots_are_clustered():
+    cadence = _cadence(
+        datetime(2025, 7, 12, 6, 5, tzinfo=UTC),
+        datetime(2025, 7, 12, 18, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),  # duplicate
+    )
+    assert cadence.slots == [timedelta(hours=6), timedelta(hours=18)]
+    assert len(cadence.history) == 3
+
+def test_backs_off_between_publications():
+    cadence = _cadence(
+        datetime(2025, 7, 12, 18, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),
+    )
+    # long before the next publication at 18:00
+    assert cadence.next_interval(datetime(2025, 7, 13, 9, 0, tzinfo=UTC)) == MAX_INTERVAL
+    # shortly before, we wake up just ahead of it
+    assert cadence.next_interval(datetime(2025, 7, 13, 17, 0, tzinfo=UTC)) == timedelta(minutes=50)
+
+def test_polls_tightly_around_publication():
+    cadence = _cadence(
+        datetime(2025, 7, 12, 18, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),
+    )
+    assert cadence.next_interval(datetime(2025, 7, 13, 17, 55, tzinfo=UTC)) == MIN_INTERVAL
+    assert cadence.next_interval(datetime(2025, 7, 13, 18, 30, tzinfo=UTC)) == MIN_INTERVAL
+
+def test_skipped_publication_moves_to_next_slot():
+    cadence = _cadence(
+        datetime(2025, 7, 12, 18, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),
+    )
+    # the 18:00 forecast did not show up within the publication window
+    assert cadence.next_publication(datetime(2025, 7, 13, 19, 30, tzinfo=UTC)) == datetime(2025, 7, 14, 6, 0, tzinfo=UTC)
+
+def test_seen_publication_is_not_expected_again():
+    cadence = _cadence(
+        datetime(2025, 7, 12, 18, 0, tzinfo=UTC),
+        datetime(2025, 7, 13, 6, 0, tzinfo=UTC),
+    )
+    assert cadence.next_publication(datetime(2025, 7, 13, 6, 10, tzinfo=UTC)) == datetime(2025, 7, 13, 18, 0, tzinfo=UTC)
@@ -0,0 +1,56 @@
+import pytest
+from datetime import UTC, datetime, timedelta
+
+from custom_components.bsh_tides.calendar import BshTidesCalendar
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+@pytest.fixture
+def dummy_coordinator():
+    class DummyCoordinator:
+        def __init__(self):
+            self.bshnr = "123P"
+            self.seo_id = "dummy_station"
+            self.station_name = "Dummy Station"
+            self.data = {"station_name": self.station_name}
+            self.index = ForecastIndex([
+                ForecastEvent.create(NOW - timedelta(hours=5), "NW", "90", 0),
+                ForecastEvent.create(NOW + timedelta(hours=1), "HW", "182.4", 12),
+                ForecastEvent.create(NOW + timedelta(hours=7), "NW", "85", -5),
+                ForecastEvent.create(NOW + timedelta(days=8), "HW", "180", None, predicted=True),
+            ])
+    return DummyCoordinator()
+
+
+def test_calendar_meta(dummy_coordinator):
+    calendar = BshTidesCalendar(dummy_coordinator)
+    assert calendar.unique_id == "bsh_dummy_station_tides"
+    assert calendar.translation_key == "tides"
+
+def test_calendar_next_event(dummy_coordinator):
+    event = BshTidesCalendar(dummy_coordinator).event
+    assert event.summary == "High tide"
+    assert event.start == event.end == NOW + timedelta(hours=1)
+    assert event.description == "182 cm, +12 cm from mean"
+    assert event.location == "Dummy Station"
+
+@pytest.mark.asyncio
+async def test_calendar_events_in_range(dummy_coordinator):
+    calendar = BshTidesCalendar(dummy_coordinator)
+    events = await calendar.async_get_events(None, NOW, NOW + timedelta(days=1))
+    assert [event.summary for event in events] == ["High tide", "Low tide"]
+    events = await calendar.async_get_events(None, NOW - timedelta(days=1), NOW + timedelta(days=14))
+    assert len(events) == 4
+    assert events[-1].description == "180 cm, predicted"
+    assert len({event.uid for event in events}) == 4
+
+def test_calendar_without_events(dummy_coordinator):
+    dummy_coordinator.index = ForecastIndex([])
+    assert BshTidesCalendar(dummy_coordinator).event is None
+    assert not BshTidesCalendar(dummy_coordinator).available
+
+def test_calendar_available_when_refresh_fails(dummy_coordinator):
+    dummy_coordinator.last_update_success = False
+    assert BshTidesCalendar(dummy_coordinator).available
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.bsh_tides import catalogue as catalogue_module
+from custom_components.bsh_tides.bsh_api import BshApi
+from custom_components.bsh_tides.catalogue import StationCatalogue, StationCatalogueCache
+from custom_components.bsh_tides.exceptions import BshCannotConnect
+
+STATIONS = [
+    ("101P", "Hamburg St. Pauli", "Elbe"),
+    ("102P", "Cuxhaven", "Elbe"),
+    ("201P", "Bremerhaven", "Weser"),
+]
+
+
+@pytest.fixture
+def fetch_station_list(monkeypatch):
+    fetch = AsyncMock(return_value=STATIONS)
+    monkeypatch.setattr(BshApi, "fetch_station_list", fetch)
+    monkeypatch.setattr(catalogue_module, "async_get_session", MagicMock())
+    return fetch
+
+@pytest.fixture
+def store():
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=None)
+    return store
+
+
+# --- Tests: StationCatalogue --- #
+
+def test_catalogue_index():
+    catalogue = StationCatalogue(STATIONS, datetime.now(UTC))
+    assert catalogue.areas == ["Elbe", "Weser"]
+    assert list(catalogue.stations("Elbe").items()) == [("102P", "Cuxhaven"), ("101P", "Hamburg St. Pauli")]
+    assert catalogue.stations("Ems") == {}
+    assert catalogue.name("201P") == "Bremerhaven"
+    assert catalogue.name("999X") is None
+
+def test_catalogue_round_trip():
+    catalogue = StationCatalogue(STATIONS, datetime(2025, 7, 13, tzinfo=UTC))
+    restored = StationCatalogue.from_dict(catalogue.as_dict())
+    assert restored.fetched == catalogue.fetched
+    assert restored.names == catalogue.names
+    assert restored.stations("Elbe") == catalogue.stations("Elbe")
+
+
+# --- Tests: StationCatalogueCache --- #
+
+@pytest.mark.asyncio
+async def test_cache_fetches_once_per_ttl(fetch_station_list, store):
+    cache = StationCatalogueCache(MagicMock(), store)
+    first, second = await asyncio.gather(cache.async_get(), cache.async_get())
+    assert first is second
+    assert fetch_station_list.await_count == 1
+    store.async_delay_save.assert_called_once()
+
+    cache.ttl = timedelta(0)
+    await cache.async_get()
+    assert fetch_station_list.await_count == 2
+
+@pytest.mark.asyncio
+async def test_cache_loads_from_disk(fetch_station_list, store):
+    store.async_load.return_value = StationCatalogue(STATIONS, datetime.now(UTC)).as_dict()
+    catalogue = await StationCatalogueCache(MagicMock(), store).async_get()
+    assert catalogue.name("102P") == "Cuxhaven"
+    fetch_station_list.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_cache_uses_outdated_catalogue_on_error(fetch_station_list, store):
+    store.async_load.return_value = StationCatalogue(STATIONS, datetime(2025, 7, 13, tzinfo=UTC)).as_dict()
+    fetch_station_list.side_effect = BshCannotConnect("Could not connect")
+    catalogue = await StationCatalogueCache(MagicMock(), store).async_get()
+    assert catalogue.name("102P") == "Cuxhaven"
+    fetch_station_list.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_cache_raises_without_catalogue(fetch_station_list, store):
+    fetch_station_list.side_effect = BshCannotConnect("Could not connect")
+    with pytest.raises(BshCannotConnect):
+        await StationCatalogueCache(MagicMock(), store).async_get()
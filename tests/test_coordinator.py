@@ -1,9 +1,24 @@
+import asyncio
 import pytest
+import math
+from datetime import UTC, datetime, timedelta
+from contextlib import nullcontext
 from unittest.mock import AsyncMock, MagicMock
-from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from custom_components.bsh_tides import coordinator as coordinator_module
+from custom_components.bsh_tides.calendar import BshTidesCalendar
+from custom_components.bsh_tides.const import TideEvent
 from custom_components.bsh_tides.coordinator import BshTidesCoordinator
-from custom_components.bsh_tides.exceptions import BshCannotConnect
+from custom_components.bsh_tides.exceptions import BshCannotConnect, BshCircuitOpen
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+from custom_components.bsh_tides.scheduler import BshRefreshScheduler
+from custom_components.bsh_tides.sensor import (
+    BshMeanWaterLevelSensor,
+    BshTideEventTimeSensor,
+    BshTideLevelSensor,
+)
 
 
 @pytest.fixture
@@ -13,7 +28,7 @@ def dummy_hass():
         def __init__(self):
             self.data = {}
             self.bus = None
-            self.config = None
+            self.config = MagicMock(components=set())
 
     return DummyHass()
 
@@ -48,6 +63,17 @@ async def test_coordinator_update_fails_on_api_error(mock_bsh_api, dummy_coordin
 
     # Check if the correct error message is raised
     assert "Could not connect to BSH API" in str(exc.value)
+    assert dummy_coordinator.telemetry.consecutive_failures == 1
+
+@pytest.mark.asyncio
+async def test_coordinator_update_fails_while_circuit_open(mock_bsh_api, dummy_coordinator):
+    """Test that a skipped request fails the update without resetting the validators."""
+    mock_bsh_api.async_fetch_data = AsyncMock(side_effect=BshCircuitOpen("BSH API is unavailable"))
+
+    with pytest.raises(UpdateFailed, match="BSH API is unavailable"):
+        await dummy_coordinator._async_update_data()
+    mock_bsh_api.reset_validators.assert_not_called()
+    assert dummy_coordinator.telemetry.consecutive_failures == 1
 
 @pytest.mark.asyncio
 async def test_coordinator_parses_forecast_data(mock_bsh_api, dummy_coordinator):
@@ -74,9 +100,16 @@ async def test_coordinator_parses_forecast_data(mock_bsh_api, dummy_coordinator)
     assert len(dummy_coordinator._parsed_forecast_data) == 3  # Should have 3 parsed items
     assert dummy_coordinator.station_name == "Dummy Station"
     assert dummy_coordinator.seo_id == "dummy_station"
-    assert dummy_coordinator.forecast_data[0]["forecast"] == 0
-    assert dummy_coordinator.forecast_data[1]["forecast"] == -10
-    assert dummy_coordinator.forecast_data[2]["forecast"] == 30
+    assert dummy_coordinator.forecast_data[0].forecast == 0
+    assert dummy_coordinator.forecast_data[1].forecast == -10
+    assert dummy_coordinator.forecast_data[2].forecast == 30
+    # timestamps are parsed once into timezone-aware datetimes
+    assert dummy_coordinator.forecast_data[0].time.tzinfo is not None
+    # the next events snapshot is cached between reads
+    assert dummy_coordinator.next_events is dummy_coordinator.next_events
+    assert len(dummy_coordinator.index.events) == 3
+    assert len(dummy_coordinator.telemetry.parse_time) == 1
+    assert dummy_coordinator.telemetry.last_success is not None
 
 @pytest.mark.asyncio
 async def test_coordinator_parses_curve_forecast(mock_bsh_api, dummy_coordinator):
@@ -188,8 +221,434 @@ async def test_coordinator_parses_curve_forecast(mock_bsh_api, dummy_coordinator
     assert dummy_coordinator.station_name == "Dummy Station"
     assert dummy_coordinator.seo_id == "dummy_station"
     # check the low tide event
-    assert dummy_coordinator.forecast_data[0]["timestamp"] == "2025-07-13 15:30:00+02:00"
-    assert dummy_coordinator.forecast_data[0]["forecast"] == -35
+    assert dummy_coordinator.forecast_data[0].time == datetime(2025, 7, 13, 13, 30, tzinfo=UTC)
+    assert dummy_coordinator.forecast_data[0].forecast == -35
     # check the high tide event
-    assert dummy_coordinator.forecast_data[1]["timestamp"] == "2025-07-13 20:50:00+02:00"
-    assert dummy_coordinator.forecast_data[1]["forecast"] == 40
+    assert dummy_coordinator.forecast_data[1].forecast == 40
+    assert dummy_coordinator.forecast_data[1].time == datetime(2025, 7, 13, 18, 50, tzinfo=UTC)
+    # the water level follows the curve
+    assert dummy_coordinator.level_model.level(datetime(2025, 7, 13, 12, 35, tzinfo=UTC)) == pytest.approx(411.5)
+
+@pytest.mark.asyncio
+async def test_coordinator_skips_unchanged_forecast(mock_bsh_api, dummy_coordinator):
+    """Test that an unchanged forecast is not parsed again."""
+    payload = {
+        "station_name": "Dummy Station",
+        "creation_forecast": "2025-07-13 06:00:00+02:00",
+        "hwnw_forecast": {
+            "data": [{"timestamp": "2025-07-13T12:00:00", "forecast": "-0,1 m"}]
+        },
+    }
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=payload)
+    dummy_coordinator.data = await dummy_coordinator._async_update_data()
+    mock_bsh_api.async_fetch_data.assert_awaited_with(conditional=False)
+    parsed = dummy_coordinator.forecast_data
+
+    # 304 / identical body: the API returns None
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=None)
+    assert await dummy_coordinator._async_update_data() is payload
+    mock_bsh_api.async_fetch_data.assert_awaited_with(conditional=True)
+
+    # changed body, but same forecast creation time
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=dict(payload))
+    assert await dummy_coordinator._async_update_data() is payload
+
+    assert dummy_coordinator.forecast_data is parsed
+    assert dummy_coordinator.full_refreshes == 1
+    assert dummy_coordinator.skipped_refreshes == 2
+    # the publication was learned for the adaptive refresh interval
+    assert len(dummy_coordinator.cadence.history) == 1
+    assert dummy_coordinator.update_interval == dummy_coordinator.refresh_interval
+
+@pytest.mark.asyncio
+async def test_coordinator_parses_new_forecast(mock_bsh_api, dummy_coordinator):
+    """Test that a new forecast creation time triggers a full parse."""
+    payload = {
+        "station_name": "Dummy Station",
+        "creation_forecast": "2025-07-13 06:00:00+02:00",
+        "hwnw_forecast": {
+            "data": [{"timestamp": "2025-07-13T12:00:00", "forecast": "-0,1 m"}]
+        },
+    }
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=payload)
+    dummy_coordinator.data = await dummy_coordinator._async_update_data()
+
+    new_payload = {
+        "station_name": "Dummy Station",
+        "creation_forecast": "2025-07-13 12:00:00+02:00",
+        "hwnw_forecast": {
+            "data": [{"timestamp": "2025-07-13T18:00:00", "forecast": "+0,2 m"}]
+        },
+    }
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=new_payload)
+    dummy_coordinator.data = await dummy_coordinator._async_update_data()
+
+    assert dummy_coordinator.forecast_data[0].forecast == 20
+    assert dummy_coordinator.full_refreshes == 2
+    assert dummy_coordinator.skipped_refreshes == 0
+
+@pytest.mark.asyncio
+async def test_coordinator_updates_listeners_at_event_boundary(monkeypatch, mock_bsh_api, dummy_coordinator):
+    """Test that the sensors are updated when the next event passes."""
+    tracked = []
+    monkeypatch.setattr(
+        coordinator_module,
+        "async_track_point_in_utc_time",
+        lambda hass, action, point_in_time: tracked.append((action, point_in_time)) or MagicMock(),
+    )
+    next_high = datetime.now(UTC) + timedelta(hours=1)
+    next_low = datetime.now(UTC) + timedelta(hours=7)
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "hwnw_forecast": {
+            "data": [
+                {"timestamp": next_high.isoformat(), "forecast": "+0,1 m", "event": "HW"},
+                {"timestamp": next_low.isoformat(), "forecast": "-0,1 m", "event": "NW"},
+            ]
+        },
+    })
+    dummy_coordinator.data = await dummy_coordinator._async_update_data()
+    listener = MagicMock()
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", listener)
+
+    dummy_coordinator.async_update_listeners()
+    assert len(tracked) == 1
+    action, point_in_time = tracked[0]
+    assert point_in_time == next_high
+
+    # updating again does not arm a second callback for the same boundary
+    dummy_coordinator.async_update_listeners()
+    assert len(tracked) == 1
+
+    # once the event passed, the listeners are updated and the callback is re-armed for the next one
+    monkeypatch.setattr(dummy_coordinator, "_next_events", ForecastIndex(dummy_coordinator.forecast_data).snapshot(next_high))
+    action(next_high)
+    assert listener.call_count == 3
+    assert tracked[1][1] == next_low
+
+def test_coordinator_finds_extrema_in_curve_columns(dummy_coordinator):
+    """Test that a curve decoded into columns gives the same extrema as the full payload."""
+    curve = [
+        {"timestamp": f"2025-07-13 {hour:02d}:00:00+02:00", "curveforecast": value}
+        for hour, value in enumerate([500, 600, 700, 600, 500, 400, 500, 600])
+    ]
+    data = {"MHW": 650, "MNW": 450, "curve_forecast": {"data": curve}}
+    columns = {
+        "MHW": 650,
+        "MNW": 450,
+        "curve_forecast": {
+            "timestamps": [item["timestamp"] for item in curve],
+            "values": [item["curveforecast"] for item in curve],
+        },
+    }
+    extrema = dummy_coordinator._find_curve_extrema(data)
+    assert [item.event for item in extrema] == ["HW", "NW"]
+    assert dummy_coordinator._find_curve_extrema(columns) == extrema
+
+@pytest.mark.asyncio
+async def test_coordinator_restores_cached_forecast(monkeypatch, dummy_hass, mock_bsh_api):
+    """Test that the last parsed forecast is cached and restored with its future events only."""
+    monkeypatch.setattr(coordinator_module, "async_track_point_in_utc_time", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", MagicMock())
+    store = MagicMock()
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    coordinator.api = mock_bsh_api
+    past = datetime.now(UTC) - timedelta(hours=1)
+    future = datetime.now(UTC) + timedelta(hours=5)
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "MHW": 180,
+        "creation_forecast": "2025-07-13 06:00:00+02:00",
+        "hwnw_forecast": {
+            "data": [
+                {"timestamp": past.isoformat(), "forecast": "+0,1 m", "event": "HW", "value": "1,0"},
+                {"timestamp": future.isoformat(), "forecast": "-0,2 m", "event": "NW", "value": "2,0"},
+            ]
+        },
+    })
+    coordinator.data = await coordinator._async_update_data()
+    store.async_delay_save.assert_called_once()
+    snapshot = store.async_delay_save.call_args.args[0]()
+    assert "hwnw_forecast" not in snapshot["data"]
+    assert snapshot["data"]["MHW"] == 180
+    assert snapshot["forecast_type"] == "peak_value_forecast"
+    assert len(snapshot["events"]) == 2
+
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=snapshot)
+    restored = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    assert await restored.async_restore()
+    assert restored.data == snapshot["data"]
+    assert restored.forecast_type == "peak_value_forecast"
+    assert restored.forecast_created == coordinator.forecast_created
+    assert restored.forecast_data == coordinator.forecast_data[1:]
+    assert restored.next_events.get("NW").forecast == -20
+
+@pytest.mark.asyncio
+async def test_coordinator_parses_same_forecast_after_restore(monkeypatch, dummy_hass, mock_bsh_api):
+    """Test that the first fetch after a restore is parsed, even if the forecast did not change."""
+    monkeypatch.setattr(coordinator_module, "async_track_point_in_utc_time", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", MagicMock())
+    start = datetime.now(UTC) - timedelta(hours=3)
+    payload = {
+        "station_name": "Dummy Station",
+        "MHW": 744,
+        "MNW": 430,
+        "creation_forecast": "2025-07-13 06:00:00+02:00",
+        "curve_forecast": {
+            "data": [
+                {
+                    "timestamp": (start + timedelta(minutes=10 * i)).isoformat(),
+                    "curveforecast": 587 + 157 * math.cos(2 * math.pi * i / 74.5),
+                }
+                for i in range(144)
+            ]
+        },
+    }
+    store = MagicMock()
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    coordinator.api = mock_bsh_api
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value=payload)
+    coordinator.data = await coordinator._async_update_data()
+    snapshot = store.async_delay_save.call_args.args[0]()
+
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=snapshot)
+    restored = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    restored.api = mock_bsh_api
+    assert await restored.async_restore()
+    restored.data = await restored._async_update_data()
+    assert mock_bsh_api.async_fetch_data.call_args.kwargs["conditional"] is False
+    assert restored.skipped_refreshes == 0
+    assert restored.full_refreshes == 1
+    assert restored.level_model.level(datetime.now(UTC)) is not None
+
+    # from now on an unchanged forecast is skipped
+    await restored._async_update_data()
+    assert restored.skipped_refreshes == 1
+
+@pytest.mark.asyncio
+async def test_restored_forecast_stays_available_when_refresh_fails(monkeypatch, dummy_hass, mock_bsh_api):
+    """Test that the forecast-backed sensors use the restored forecast while the BSH API cannot be reached."""
+    monkeypatch.setattr(coordinator_module, "async_track_point_in_utc_time", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "_schedule_refresh", MagicMock())
+    now = datetime.now(UTC)
+    snapshot = {
+        "data": {"station_name": "Dummy Station", "MHW": 180, "MNW": 90},
+        "forecast_type": "peak_value_forecast",
+        "events": [
+            ForecastEvent.create(now + timedelta(hours=1), "HW", 200, 20).as_dict(),
+            ForecastEvent.create(now + timedelta(hours=7), "NW", 80, -10).as_dict(),
+        ],
+    }
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=snapshot)
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    coordinator.api = mock_bsh_api
+    mock_bsh_api.async_fetch_data = AsyncMock(side_effect=BshCannotConnect("Could not connect to BSH API"))
+    assert await coordinator.async_restore()
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    sensors = (
+        BshTideEventTimeSensor(coordinator),
+        BshTideLevelSensor(coordinator, TideEvent.HIGH),
+        BshTideLevelSensor(coordinator, TideEvent.LOW),
+        BshTidesCalendar(coordinator),
+    )
+    assert all(sensor.available for sensor in sensors)
+    assert BshTideLevelSensor(coordinator, TideEvent.LOW).native_value == 80
+    # the sensors of the station data follow the refreshes
+    assert not BshMeanWaterLevelSensor(coordinator, TideEvent.HIGH).available
+
+@pytest.mark.asyncio
+async def test_coordinator_ignores_unusable_cache(dummy_hass):
+    """Test that a missing, invalid or outdated cache is not restored."""
+    store = MagicMock()
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", store=store)
+    past = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+    for cached in (
+        None,
+        {"data": {}},
+        {"data": {}, "forecast_type": "curve_forecast", "events": [{"time": past, "event": "HW"}]},
+    ):
+        store.async_load = AsyncMock(return_value=cached)
+        assert not await coordinator.async_restore()
+    assert coordinator.data is None
+    assert not await BshTidesCoordinator(hass=dummy_hass, bshnr="999X").async_restore()
+
+@pytest.mark.asyncio
+async def test_coordinator_predicts_beyond_forecast(dummy_hass, mock_bsh_api):
+    """Test that locally predicted tides extend the BSH forecast when enabled."""
+    async def run_inline(func, *args):
+        return func(*args)
+
+    dummy_hass.async_add_executor_job = run_inline
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", options={"harmonic_prediction": True})
+    coordinator.api = mock_bsh_api
+    start = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    curve = [
+        {
+            "timestamp": (start + timedelta(minutes=10 * i)).isoformat(),
+            "curveforecast": round(500 + 150 * math.cos(math.radians(28.9841042 * i / 6))),
+        }
+        for i in range(3 * 144)
+    ]
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "MHW": 650,
+        "MNW": 350,
+        "curve_forecast": {"data": curve},
+    })
+    coordinator.data = await coordinator._async_update_data()
+
+    forecast = [item for item in coordinator.forecast_data if not item.predicted]
+    predicted = [item for item in coordinator.forecast_data if item.predicted]
+    # the curve on a 30 minute grid plus the extrema in between
+    assert 3 * 48 < len(coordinator.history) <= 3 * 48 + len(forecast)
+    assert predicted
+    assert predicted[0].time > forecast[-1].time
+    assert predicted[-1].time > forecast[-1].time + timedelta(days=6)
+    # predicted tides are not cached, they are predicted again after a restart
+    assert all(not item.get("predicted") for item in coordinator._cache_snapshot(coordinator.data)["events"])
+
+@pytest.mark.asyncio
+async def test_predicted_tides_outlast_bsh_outage(monkeypatch, dummy_hass, mock_bsh_api):
+    """Test that the next tide sensors show predicted tides once the BSH forecast has run out and the API fails."""
+    async def run_inline(func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(coordinator_module, "async_track_point_in_utc_time", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", MagicMock())
+    monkeypatch.setattr(DataUpdateCoordinator, "_schedule_refresh", MagicMock())
+    dummy_hass.async_add_executor_job = run_inline
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", options={"harmonic_prediction": True})
+    coordinator.api = mock_bsh_api
+    # the last forecast ended an hour ago
+    start = datetime.now(UTC).replace(second=0, microsecond=0) - timedelta(days=3, hours=1)
+    curve = [
+        {
+            "timestamp": (start + timedelta(minutes=10 * i)).isoformat(),
+            "curveforecast": round(500 + 150 * math.cos(math.radians(28.9841042 * i / 6))),
+        }
+        for i in range(3 * 144)
+    ]
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "MHW": 650,
+        "MNW": 350,
+        "curve_forecast": {"data": curve},
+    })
+    coordinator.data = await coordinator._async_update_data()
+
+    mock_bsh_api.async_fetch_data = AsyncMock(side_effect=BshCannotConnect("Could not connect to BSH API"))
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    for event in (None, TideEvent.HIGH, TideEvent.LOW):
+        sensor = BshTideLevelSensor(coordinator, event)
+        assert sensor.available
+        assert 340 < sensor.native_value < 660
+        assert sensor.extra_state_attributes == {"predicted": True}
+
+@pytest.mark.asyncio
+async def test_coordinator_first_refreshes_run_in_parallel(monkeypatch):
+    """Test that many stations load their first forecast concurrently, and each only once."""
+    class TaskHass:
+        def __init__(self):
+            self.data = {}
+            self.bus = None
+            self.config = MagicMock(components=set())
+
+        def async_create_task(self, target, name=None, eager_start=True):
+            return asyncio.create_task(target, name=name)
+
+    monkeypatch.setattr(DataUpdateCoordinator, "async_update_listeners", MagicMock())
+    hass = TaskHass()
+    # 10 requests per minute: the rate budget alone would take minutes for 30 stations
+    scheduler = BshRefreshScheduler(hass, max_concurrent=4, requests_per_minute=10)
+    running = 0
+    max_running = 0
+
+    async def fetch_data(conditional=False):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return {"station_name": "Dummy Station", "hwnw_forecast": {"data": []}}
+
+    coordinators = []
+    for number in range(30):
+        coordinator = BshTidesCoordinator(hass=hass, bshnr=f"{number}X", scheduler=scheduler)
+        coordinator.api = MagicMock()
+        coordinator.api.async_fetch_data = AsyncMock(side_effect=fetch_data)
+        coordinators.append(coordinator)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(
+        *(coordinator.async_first_refresh() for coordinator in coordinators),
+        coordinators[0].async_first_refresh(),
+    )
+    # 30 fetches of 50 ms with 4 at a time, instead of 1.5 s one after the other
+    assert loop.time() - start < 1
+    assert max_running == 4
+    for coordinator in coordinators:
+        assert coordinator.api.async_fetch_data.await_count == 1
+        assert coordinator.first_refresh_duration >= 0.05
+    # A finished first refresh is not repeated
+    await coordinators[0].async_first_refresh()
+    assert coordinators[0].api.async_fetch_data.await_count == 1
+
+@pytest.mark.asyncio
+async def test_coordinator_first_refresh_fails_without_forecast(dummy_coordinator, mock_bsh_api):
+    """Test that a failed first refresh raises ConfigEntryNotReady and is tried again."""
+    dummy_coordinator.hass.async_create_task = lambda target, name=None: asyncio.create_task(target)
+    mock_bsh_api.async_fetch_data = AsyncMock(side_effect=BshCannotConnect("offline"))
+    with pytest.raises(ConfigEntryNotReady, match="offline"):
+        await dummy_coordinator.async_first_refresh()
+    with pytest.raises(ConfigEntryNotReady):
+        await dummy_coordinator.async_first_refresh()
+    assert mock_bsh_api.async_fetch_data.await_count == 2
+
+@pytest.mark.asyncio
+async def test_coordinator_parses_in_batcher(dummy_hass, mock_bsh_api):
+    """Test that payloads are parsed by the batcher of the scheduler, sized by their number of items."""
+    start = datetime.now(UTC)
+    scheduler = MagicMock()
+    scheduler.async_fetch_slot = MagicMock(side_effect=lambda rate_limited: nullcontext())
+    scheduler.batcher.async_run = AsyncMock(side_effect=lambda job, size: job())
+    coordinator = BshTidesCoordinator(hass=dummy_hass, bshnr="999X", scheduler=scheduler)
+    coordinator.api = mock_bsh_api
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "MHW": 744,
+        "MNW": 430,
+        "curve_forecast": {
+            "data": [
+                {
+                    "timestamp": (start + timedelta(minutes=10 * i)).isoformat(),
+                    "curveforecast": 587 + 157 * math.cos(2 * math.pi * i / 74.5),
+                }
+                for i in range(144)
+            ]
+        },
+    })
+
+    await coordinator._async_update_data()
+    assert scheduler.batcher.async_run.call_args.args[1] == 144
+    assert coordinator.forecast_type == "curve_forecast"
+    assert coordinator.forecast_data
+    assert len(coordinator.telemetry.parse_time) == 1
+
+    mock_bsh_api.async_fetch_data = AsyncMock(return_value={
+        "station_name": "Dummy Station",
+        "hwnw_forecast": {
+            "data": [{"timestamp": (start + timedelta(hours=1)).isoformat(), "event": "HW", "value": 750, "forecast": "+0,1 m"}]
+        },
+    })
+    await coordinator._async_update_data()
+    assert scheduler.batcher.async_run.call_args.args[1] == 1
+    assert coordinator.forecast_type == "peak_value_forecast"
+    assert len(coordinator.telemetry.parse_time) == 2
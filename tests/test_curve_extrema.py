@@ -0,0 +1,148 @@
+"""Equivalence tests of the curve extrema detection against the original implementation."""
+
+from datetime import UTC, datetime, timedelta, timezone
+import math
+import random
+
+import pytest
+
+from custom_components.bsh_tides.const import TideEvent
+from custom_components.bsh_tides.forecast import ForecastEvent, find_curve_extrema, parse_timestamp
+
+MHW = 744
+MNW = 430
+CEST = timezone(timedelta(hours=2))
+
+
+def _legacy_find_curve_extrema(data: dict) -> list[ForecastEvent]:
+    """The original item-by-item implementation of BshTidesCoordinator._find_curve_extrema.
+
+    The extrema are converted to ForecastEvent records at the end, like the current implementation returns them.
+    """
+    extrema = []
+    min_gap = timedelta(minutes=45)
+    last_extremum_time = None
+    last_extremum_value = None
+    last_extremum_event = None
+    curve = data.get("curve_forecast", {}).get("data", [])
+
+    for i in range(1, len(curve) - 1):
+        prev = curve[i - 1]
+        curr = curve[i]
+        nxt = curve[i + 1]
+
+        val = curr.get("curveforecast") or None
+        prev_val = prev.get("curveforecast") or None
+        next_val = nxt.get("curveforecast") or None
+
+        if val is None or prev_val is None or next_val is None:
+            continue
+
+        is_max = prev_val < val >= next_val
+        is_min = prev_val > val <= next_val
+
+        if not (is_max or is_min):
+            continue
+
+        ts = parse_timestamp(curr["timestamp"])
+
+        is_in_fluctuation_period = last_extremum_time and abs(ts - last_extremum_time) < min_gap
+
+        if is_in_fluctuation_period:
+            if last_extremum_event == TideEvent.HIGH.value and val < last_extremum_value:
+                continue
+            if last_extremum_event == TideEvent.LOW.value and val > last_extremum_value:
+                continue
+
+        if is_max:
+            event = TideEvent.HIGH.value
+            forecast = val - data.get("MHW", {})
+        else:
+            event = TideEvent.LOW.value
+            forecast = val - data.get("MNW", {})
+
+        new_event = {
+            "timestamp": curr["timestamp"],
+            "time": ts,
+            "value": val,
+            "event": event,
+            "forecast": forecast,
+        }
+
+        if is_in_fluctuation_period:
+            extrema[-1] = new_event
+        else:
+            extrema.append(new_event)
+
+        last_extremum_time = ts
+        last_extremum_value = val
+        last_extremum_event = event
+
+    return [
+        ForecastEvent.create(item["time"], item["event"], item["value"], item["forecast"])
+        for item in extrema
+    ]
+
+
+def _synthetic_curve(seed: int, days: int = 3) -> dict:
+    """A semidiurnal tide curve in 10 minute steps with noise, plateaus, gaps and a past section."""
+    rng = random.Random(seed)
+    start = datetime(2025, 7, 13, 0, 0, tzinfo=UTC)
+    curve = []
+    for i in range(days * 24 * 6):
+        ts = start + timedelta(minutes=10 * i)
+        level = 587 + 160 * math.sin(2 * math.pi * i / 74.5) + rng.uniform(-6, 6)
+        value = round(level)
+        if i < 30 or rng.random() < 0.01:
+            value = None  # past values and gaps
+        elif rng.random() < 0.02 and curve and curve[-1]["curveforecast"]:
+            value = curve[-1]["curveforecast"]  # plateau
+        curve.append(
+            {
+                "timestamp": ts.astimezone(CEST).isoformat(sep=" "),
+                "astro": value,
+                "curveforecast": value,
+                "measurement": None,
+            }
+        )
+    return {"MHW": MHW, "MNW": MNW, "curve_forecast": {"data": curve}}
+
+
+def _columns(data: dict):
+    curve = data["curve_forecast"]["data"]
+    return (
+        [item["timestamp"] for item in curve],
+        [item.get("curveforecast") for item in curve],
+        data["MHW"],
+        data["MNW"],
+    )
+
+
+# --- Tests --- #
+
+@pytest.mark.parametrize("seed", range(10))
+def test_python_matches_legacy(seed):
+    data = _synthetic_curve(seed)
+    assert find_curve_extrema(*_columns(data), use_numpy=False) == _legacy_find_curve_extrema(data)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_numpy_matches_legacy(seed):
+    pytest.importorskip("numpy")
+    data = _synthetic_curve(seed)
+    assert find_curve_extrema(*_columns(data), use_numpy=True) == _legacy_find_curve_extrema(data)
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_short_and_empty_curves(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    assert find_curve_extrema([], [], MHW, MNW, use_numpy=use_numpy) == []
+    assert find_curve_extrema(["2025-07-13 14:30:00+02:00"], [415], MHW, MNW, use_numpy=use_numpy) == []
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_zero_is_treated_as_empty(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    timestamps = [f"2025-07-13 1{i}:00:00+02:00" for i in range(5)]
+    assert find_curve_extrema(timestamps, [400, 0, 400, 390, 400], MHW, MNW, use_numpy=use_numpy) == [
+        ForecastEvent.create(parse_timestamp(timestamps[3]), TideEvent.LOW.value, 390, 390 - MNW)
+    ]
@@ -0,0 +1,117 @@
+import json
+import pytest
+
+from custom_components.bsh_tides import decoding as decoding_module
+from custom_components.bsh_tides.decoding import (
+    HashingReader,
+    async_decode_station_stream,
+    json_loads,
+    missing_keys,
+    streaming_available,
+)
+
+requires_ijson = pytest.mark.skipif(not streaming_available(), reason="ijson is not installed")
+
+PAYLOAD = {
+    "station_name": "Dummy Station",
+    "seo_id": "dummy_station",
+    "bshnr": "999X",
+    "MHW": 744,
+    "MNW": 430,
+    "area": "Elbe",
+    "creation_forecast": "2025-07-13 06:00:00+02:00",
+    "hwnw_forecast": {
+        "head": {"unit": "cm"},
+        "data": [
+            {"timestamp": "2025-07-13 12:00:00+02:00", "event": "HW", "value": 750.5, "forecast": "+0,1 m"},
+            {"timestamp": "2025-07-13 18:10:00+02:00", "event": "NW", "value": 420, "forecast": "-0,1 m"},
+        ],
+    },
+    "curve_forecast": {
+        "data": [
+            {"timestamp": "2025-07-13 14:30:00+02:00", "astro": 475, "curveforecast": None, "measurement": 410},
+            {"timestamp": "2025-07-13 14:40:00+02:00", "astro": 471, "curveforecast": 408, "measurement": None},
+            {"timestamp": "2025-07-13 14:50:00+02:00", "astro": 466, "curveforecast": 400.5, "measurement": None},
+        ]
+    },
+}
+
+
+class ChunkedReader:
+    """Serves a body in small chunks, like a network stream."""
+
+    def __init__(self, body: bytes, chunk_size: int = 7):
+        self._body = body
+        self._chunk_size = chunk_size
+
+    async def read(self, n: int = -1) -> bytes:
+        size = self._chunk_size if n < 0 else min(n, self._chunk_size)
+        chunk, self._body = self._body[:size], self._body[size:]
+        return chunk
+
+
+@requires_ijson
+@pytest.mark.asyncio
+async def test_decode_station_stream():
+    data = await async_decode_station_stream(ChunkedReader(json.dumps(PAYLOAD).encode()))
+
+    assert data == {
+        "station_name": "Dummy Station",
+        "seo_id": "dummy_station",
+        "MHW": 744,
+        "MNW": 430,
+        "area": "Elbe",
+        "creation_forecast": "2025-07-13 06:00:00+02:00",
+        "hwnw_forecast": {"data": PAYLOAD["hwnw_forecast"]["data"]},
+        "curve_forecast": {
+            "timestamps": [item["timestamp"] for item in PAYLOAD["curve_forecast"]["data"]],
+            "values": [None, 408, 400.5],
+        },
+    }
+    assert isinstance(data["hwnw_forecast"]["data"][0]["value"], float)
+
+@requires_ijson
+@pytest.mark.asyncio
+async def test_decode_station_list_is_detected():
+    body = json.dumps({"gauges": [{"bshnr": "999X"}]}).encode()
+    data = await async_decode_station_stream(ChunkedReader(body))
+    assert "gauges" in data
+    assert "station_name" not in data
+
+@requires_ijson
+@pytest.mark.asyncio
+async def test_decode_invalid_json():
+    with pytest.raises(ValueError):
+        await async_decode_station_stream(ChunkedReader(b'{"station_name": "Dummy'))
+
+@requires_ijson
+@pytest.mark.asyncio
+async def test_hashing_reader():
+    body = json.dumps(PAYLOAD).encode()
+    first = HashingReader(ChunkedReader(body))
+    await async_decode_station_stream(first)
+    second = HashingReader(ChunkedReader(body, chunk_size=100))
+    await async_decode_station_stream(second)
+    assert first.size == len(body)
+    assert first.hexdigest() == second.hexdigest()
+
+
+# --- Tests: bytes decoding --- #
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_json_loads(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(decoding_module, "orjson", None)
+    elif decoding_module.orjson is None:
+        pytest.skip("orjson is not installed")
+    body = json.dumps(PAYLOAD).encode()
+    assert json_loads(body) == PAYLOAD
+    with pytest.raises(ValueError):
+        json_loads(b'{"station_name": "Dummy')
+
+def test_missing_keys():
+    body = json.dumps(PAYLOAD).encode()
+    assert missing_keys(body, ("station_name", "hwnw_forecast")) == []
+    assert missing_keys(body, ("station_name", "gauges")) == ["gauges"]
+    assert missing_keys(b'{"station": "station_name"}', ("station_name",)) == []
+    assert missing_keys(b"", ("station_name",)) == ["station_name"]
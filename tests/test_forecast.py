@@ -0,0 +1,74 @@
+from datetime import UTC, datetime, timedelta
+
+from custom_components.bsh_tides.const import TideEvent
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+
+NOW = datetime(2025, 7, 13, 12, 0, tzinfo=UTC)
+
+
+def _event(hours: float, event: TideEvent) -> ForecastEvent:
+    return ForecastEvent.create(NOW + timedelta(hours=hours), event.value, 500, 10)
+
+
+# --- Tests: ForecastEvent --- #
+
+def test_event_converts_values():
+    event = ForecastEvent.create(NOW, "HW", "165.6", 30.0)
+    assert event.value == 165.6
+    assert event.level == 166
+    assert event.forecast == 30
+
+def test_event_invalid_values():
+    event = ForecastEvent.create(NOW, "HW", "", "not a number")
+    assert event.value is None
+    assert event.level is None
+    assert event.forecast is None
+    assert ForecastEvent.create(NOW, "NW", "lala", None).level is None
+
+
+# --- Tests: ForecastIndex --- #
+
+def test_index_is_sorted():
+    index = ForecastIndex([_event(6, TideEvent.HIGH), _event(-6, TideEvent.HIGH), _event(0, TideEvent.LOW)])
+    assert [item.time for item in index.events] == sorted(item.time for item in index.events)
+
+def test_next_event_lanes():
+    events = [
+        _event(-5, TideEvent.LOW),
+        _event(1, TideEvent.HIGH),
+        _event(7, TideEvent.LOW),
+        _event(13, TideEvent.HIGH),
+    ]
+    index = ForecastIndex(events)
+    assert index.next_event(NOW) is events[1]
+    assert index.next_event(NOW, TideEvent.HIGH) is events[1]
+    assert index.next_event(NOW, TideEvent.LOW) is events[2]
+    assert index.next_event(NOW + timedelta(hours=14)) is None
+
+def test_next_event_is_strictly_after_now():
+    events = [_event(0, TideEvent.HIGH), _event(6, TideEvent.LOW)]
+    assert ForecastIndex(events).next_event(NOW) is events[1]
+
+
+# --- Tests: NextEvents --- #
+
+def test_snapshot():
+    events = [_event(1, TideEvent.HIGH), _event(7, TideEvent.LOW), _event(13, TideEvent.HIGH)]
+    snapshot = ForecastIndex(events).snapshot(NOW)
+    assert snapshot.get() is events[0]
+    assert snapshot.get(TideEvent.HIGH) is events[0]
+    assert snapshot.get(TideEvent.LOW) is events[1]
+    assert snapshot.valid_until == events[0].time
+
+def test_between():
+    events = [_event(hours, TideEvent.HIGH if hours % 12 else TideEvent.LOW) for hours in range(-12, 48, 6)]
+    index = ForecastIndex(events)
+    assert index.between(NOW, NOW + timedelta(hours=12)) == events[2:4]
+    assert index.between(NOW, NOW + timedelta(hours=24), TideEvent.LOW) == [events[2], events[4]]
+    assert index.between(NOW + timedelta(hours=1), NOW + timedelta(hours=2)) == []
+    assert index.between(NOW - timedelta(days=7), NOW + timedelta(days=7)) == events
+
+def test_empty_snapshot():
+    snapshot = ForecastIndex([]).snapshot(NOW)
+    assert snapshot.get() is None
+    assert snapshot.valid_until is None
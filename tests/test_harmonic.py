@@ -0,0 +1,93 @@
+import math
+from datetime import UTC, datetime, timedelta
+
+from custom_components.bsh_tides.forecast import ForecastEvent
+from custom_components.bsh_tides.harmonic import (
+    CONSTITUENTS,
+    HarmonicModel,
+    TideHistory,
+    predict_events,
+    select_constituents,
+)
+
+START = datetime(2025, 7, 1, tzinfo=UTC)
+
+
+def _synthetic_level(ts: float) -> float:
+    """A tide of M2, S2 and K1 around a mean level of 500 cm."""
+    hours = (ts - START.timestamp()) / 3600
+    return (
+        500
+        + 150 * math.cos(math.radians(CONSTITUENTS["M2"] * hours) - 0.3)
+        + 40 * math.cos(math.radians(CONSTITUENTS["S2"] * hours) - 1.1)
+        + 10 * math.cos(math.radians(CONSTITUENTS["K1"] * hours) + 0.5)
+    )
+
+def _synthetic_history(days: int) -> tuple[list[int], list[float]]:
+    times = list(range(int(START.timestamp()), int((START + timedelta(days=days)).timestamp()), 1800))
+    return times, [_synthetic_level(ts) for ts in times]
+
+
+# --- Tests: constituents --- #
+
+def test_select_constituents_by_span():
+    # M2 and S2 can only be told apart after ~15 days
+    assert "S2" not in select_constituents(timedelta(days=3))
+    assert {"M2", "K1", "M4"} <= set(select_constituents(timedelta(days=3)))
+    assert {"M2", "S2", "K1", "O1"} <= set(select_constituents(timedelta(days=20)))
+    # K2 and P1 need half a year
+    assert "K2" not in select_constituents(timedelta(days=30))
+
+
+# --- Tests: fit and prediction --- #
+
+def test_fit_and_predict():
+    times, levels = _synthetic_history(20)
+    model = HarmonicModel.fit(times, levels)
+    assert model is not None
+    future = [times[-1] + hours * 3600 for hours in range(1, 72)]
+    predicted = model.predict(future)
+    assert max(abs(level - _synthetic_level(ts)) for ts, level in zip(future, predicted)) < 1
+
+def test_fit_needs_history():
+    times, levels = _synthetic_history(1)
+    assert HarmonicModel.fit(times[:10], levels[:10]) is None
+    assert predict_events(times[:10], levels[:10], START, 500, 300) == []
+
+def test_predict_events():
+    times, levels = _synthetic_history(20)
+    start = START + timedelta(days=20)
+    events = predict_events(times, levels, start, 600, 400)
+    assert all(item.predicted for item in events)
+    assert all(start < item.time < start + timedelta(days=7) for item in events)
+    # about two high and two low tides per day
+    assert 24 <= len(events) <= 30
+    high = [item for item in events if item.event == "HW"]
+    assert all(item.forecast == int(item.value - 600) for item in high)
+
+
+# --- Tests: history --- #
+
+def test_history_keeps_grid_and_events():
+    history = TideHistory()
+    history.add_curve(
+        ["2025-07-13 14:00:00+02:00", "2025-07-13 14:10:00+02:00", "2025-07-13 14:30:00+02:00", "2025-07-13 14:40:00+02:00"],
+        [400, 410, None, 450],
+    )
+    assert len(history) == 1
+    event_time = datetime(2025, 7, 13, 12, 40, tzinfo=UTC)
+    history.add_events([
+        ForecastEvent.create(event_time, "HW", 452, 0),
+        ForecastEvent.create(event_time + timedelta(hours=6), "NW", 200, 0, predicted=True),
+    ])
+    assert history.columns() == ([int(event_time.timestamp()) - 2400, int(event_time.timestamp())], [400.0, 452.0])
+
+    # newer forecasts replace the levels
+    history.add_curve(["2025-07-13 14:00:00+02:00"], [405])
+    assert history.columns()[1][0] == 405
+
+    restored = TideHistory.from_dict(history.as_dict())
+    assert restored.columns() == history.columns()
+
+    history.prune(event_time + timedelta(days=30, minutes=-10))
+    assert history.columns() == ([int(event_time.timestamp())], [452.0])
@@ -0,0 +1,50 @@
+import pytest
+from datetime import UTC, datetime, timedelta
+
+from custom_components.bsh_tides.forecast import ForecastEvent
+from custom_components.bsh_tides.interpolation import TideLevelModel
+
+START = datetime(2025, 7, 13, 12, 0, tzinfo=UTC)
+
+
+# --- Tests: curve forecast --- #
+
+def test_curve_linear_interpolation():
+    timestamps = ["2025-07-13 14:00:00+02:00", "2025-07-13 14:10:00+02:00", "2025-07-13 14:20:00+02:00"]
+    model = TideLevelModel.from_curve(timestamps, [400, 410, 430])
+    assert model.level(START) == 400
+    assert model.level(START + timedelta(minutes=5)) == pytest.approx(405)
+    assert model.level(START + timedelta(minutes=15)) == pytest.approx(420)
+    assert model.level(START + timedelta(minutes=20)) == 430
+
+def test_curve_skips_empty_values():
+    timestamps = ["2025-07-13 14:00:00+02:00", "2025-07-13 14:10:00+02:00", "2025-07-13 14:20:00+02:00"]
+    model = TideLevelModel.from_curve(timestamps, [400, None, 420])
+    assert model.level(START + timedelta(minutes=10)) == pytest.approx(410)
+
+def test_outside_of_forecast():
+    model = TideLevelModel.from_curve(["2025-07-13 14:00:00+02:00", "2025-07-13 14:10:00+02:00"], [400, 410])
+    assert model.level(START - timedelta(seconds=1)) is None
+    assert model.level(START + timedelta(minutes=11)) is None
+
+def test_empty_model():
+    model = TideLevelModel.from_curve(["2025-07-13 14:00:00+02:00"], [400])
+    assert not model
+    assert model.level(START) is None
+
+
+# --- Tests: high and low tide events --- #
+
+def test_events_cosine_interpolation():
+    events = [
+        ForecastEvent.create(START, "NW", 100, 0),
+        ForecastEvent.create(START + timedelta(hours=6), "HW", 300, 0),
+        ForecastEvent.create(START + timedelta(hours=12), "NW", "", 0),
+    ]
+    model = TideLevelModel.from_events(events)
+    # the event without a value is not part of the model
+    assert model.level(START + timedelta(hours=7)) is None
+    assert model.level(START + timedelta(hours=3)) == pytest.approx(200)
+    # the tide rises slowly after low tide and fast around mid tide
+    assert model.level(START + timedelta(hours=1)) == pytest.approx(100 + 200 * (1 - 0.8660254) / 2)
+    assert model.level(START + timedelta(hours=6)) == 300
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import MagicMock
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.bsh_tides import config_flow as config_flow_module
+from custom_components.bsh_tides.config_flow import BshTidesOptionsFlow
+
+
+@pytest.fixture
+def options_flow():
+    entry = MagicMock()
+    entry.options = {}
+    flow = BshTidesOptionsFlow()
+    flow.hass = MagicMock()
+    flow.hass.config_entries.async_get_known_entry.return_value = entry
+    flow.handler = "dummy_id"
+    return flow
+
+
+@pytest.mark.asyncio
+async def test_options_flow_form(monkeypatch, options_flow):
+    monkeypatch.setattr(config_flow_module, "streaming_available", lambda: True)
+    result = await options_flow.async_step_init()
+    assert result["type"] is FlowResultType.FORM
+    defaults = result["data_schema"]({})
+    assert defaults == {
+        "min_refresh_interval": 10,
+        "max_refresh_interval": 120,
+        "streaming_decode": False,
+        "harmonic_prediction": False,
+    }
+
+@pytest.mark.asyncio
+async def test_options_flow_submit_defaults(options_flow):
+    form = await options_flow.async_step_init()
+    user_input = form["data_schema"]({"harmonic_prediction": True})
+    result = await options_flow.async_step_init(user_input)
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"]["harmonic_prediction"] is True
+    assert result["data"]["max_refresh_interval"] == 120
+
+@pytest.mark.asyncio
+async def test_options_flow_invalid_interval(options_flow):
+    form = await options_flow.async_step_init()
+    user_input = form["data_schema"]({"min_refresh_interval": 200, "max_refresh_interval": 100})
+    result = await options_flow.async_step_init(user_input)
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_refresh_interval"}
+
+@pytest.mark.asyncio
+async def test_options_flow_without_ijson(monkeypatch, options_flow):
+    monkeypatch.setattr(config_flow_module, "streaming_available", lambda: False)
+    form = await options_flow.async_step_init()
+    user_input = form["data_schema"]({})
+    assert "streaming_decode" not in user_input
+    result = await options_flow.async_step_init(user_input)
+    assert result["type"] is FlowResultType.CREATE_ENTRY
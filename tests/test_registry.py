@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.bsh_tides.registry import BshCoordinatorRegistry
+
+
+@pytest.fixture
+def registry():
+    hass = MagicMock()
+    hass.async_create_task = lambda target, name=None: asyncio.create_task(target, name=name)
+    return BshCoordinatorRegistry(hass)
+
+def _creator(bshnr="999X"):
+    async def create():
+        await asyncio.sleep(0.01)
+        coordinator = MagicMock()
+        coordinator.bshnr = bshnr
+        coordinator.async_shutdown = AsyncMock()
+        return coordinator
+
+    return AsyncMock(side_effect=create)
+
+
+@pytest.mark.asyncio
+async def test_one_coordinator_per_station(registry):
+    create = _creator()
+    first, second = await asyncio.gather(
+        registry.async_acquire("999X", create), registry.async_acquire("999X", create)
+    )
+    assert first is second
+    assert await registry.async_acquire("999X", create) is first
+    create.assert_awaited_once()
+    assert registry.get("999X") is first
+
+    other = await registry.async_acquire("123P", _creator("123P"))
+    assert other is not first
+
+@pytest.mark.asyncio
+async def test_shutdown_with_last_release(registry):
+    coordinator = await registry.async_acquire("999X", _creator())
+    await registry.async_acquire("999X", _creator())
+
+    await registry.async_release("999X")
+    coordinator.async_shutdown.assert_not_awaited()
+    await registry.async_release("999X")
+    coordinator.async_shutdown.assert_awaited_once()
+    assert registry.get("999X") is None
+
+@pytest.mark.asyncio
+async def test_failed_creation_is_retried(registry):
+    create = AsyncMock(side_effect=RuntimeError("first refresh failed"))
+    results = await asyncio.gather(
+        registry.async_acquire("999X", create),
+        registry.async_acquire("999X", create),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    create.assert_awaited_once()
+
+    assert await registry.async_acquire("999X", _creator()) is registry.get("999X")
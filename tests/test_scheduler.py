@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from custom_components.bsh_tides import scheduler as scheduler_module
+from custom_components.bsh_tides.scheduler import BshRefreshScheduler
+
+
+@pytest.fixture
+def dummy_coordinator():
+    coordinator = MagicMock()
+    coordinator.bshnr = "999X"
+    coordinator.refresh_interval = timedelta(minutes=60)
+    return coordinator
+
+
+# --- Tests: jitter --- #
+
+def test_jitter_is_deterministic():
+    interval = timedelta(minutes=60)
+    assert BshRefreshScheduler.jitter("999X", interval) == BshRefreshScheduler.jitter("999X", interval)
+    assert BshRefreshScheduler.jitter("999X", interval) != BshRefreshScheduler.jitter("123P", interval)
+
+def test_jitter_within_interval():
+    interval = timedelta(minutes=60)
+    for bshnr in ("101P", "102P", "103P", "999X"):
+        assert timedelta(0) <= BshRefreshScheduler.jitter(bshnr, interval) <= interval
+
+def test_next_refresh_delay_on_slot(monkeypatch, dummy_coordinator):
+    scheduler = BshRefreshScheduler(MagicMock())
+    offset = BshRefreshScheduler.jitter("999X", timedelta(minutes=60)).total_seconds()
+    monkeypatch.setattr(scheduler_module.time, "time", lambda: 3600 * 1000 + offset + 60)
+    assert scheduler.next_refresh_delay(dummy_coordinator) == pytest.approx(3540)
+
+def test_add_and_remove(monkeypatch, dummy_coordinator):
+    unsub = MagicMock()
+    call_later = MagicMock(return_value=unsub)
+    monkeypatch.setattr(scheduler_module, "async_call_later", call_later)
+    scheduler = BshRefreshScheduler(MagicMock())
+
+    remove = scheduler.async_add(dummy_coordinator)
+    assert 0 < call_later.call_args.args[1] <= 3600
+    remove()
+    unsub.assert_called_once()
+
+
+# --- Tests: fetch slots --- #
+
+@pytest.mark.asyncio
+async def test_fetch_slot_limits_concurrency():
+    scheduler = BshRefreshScheduler(MagicMock(), max_concurrent=2, requests_per_minute=60000)
+    running = 0
+    max_running = 0
+
+    async def fetch():
+        nonlocal running, max_running
+        async with scheduler.async_fetch_slot():
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(fetch() for _ in range(6)))
+    assert max_running == 2
+
+@pytest.mark.asyncio
+async def test_fetch_slot_rate_budget():
+    # 600 requests per minute -> 0.1 s spacing
+    scheduler = BshRefreshScheduler(MagicMock(), max_concurrent=10, requests_per_minute=600)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def fetch():
+        async with scheduler.async_fetch_slot():
+            pass
+
+    await asyncio.gather(*(fetch() for _ in range(3)))
+    assert loop.time() - start >= 0.19
+
+@pytest.mark.asyncio
+async def test_fetch_slot_without_rate_limit():
+    scheduler = BshRefreshScheduler(MagicMock(), max_concurrent=10, requests_per_minute=600)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def fetch():
+        async with scheduler.async_fetch_slot(rate_limited=False):
+            pass
+
+    await asyncio.gather(*(fetch() for _ in range(10)))
+    assert loop.time() - start < 0.1
+    # The first fetches don't use up the budget of the regular refreshes
+    async with scheduler.async_fetch_slot():
+        pass
+    assert loop.time() - start < 0.1
@@ -1,13 +1,23 @@
 import pytest
 from datetime import datetime, timedelta, UTC
+from unittest.mock import MagicMock
+from homeassistant.helpers.entity import Entity
 
 from custom_components.bsh_tides.const import TideEvent
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+from custom_components.bsh_tides.interpolation import TideLevelModel
+from custom_components.bsh_tides.telemetry import StationTelemetry
 from custom_components.bsh_tides.sensor import (
+    BshConsecutiveFailuresSensor,
+    BshCurrentTideLevelSensor,
     BshForecastCreatedSensor,
     BshForecastTypeSensor,
     BshMeanWaterLevelSensor,
     BshNextTideEventSensor,
+    BshRefreshesSensor,
     BshStationAreaSensor,
+    BshLastSuccessSensor,
+    BshTelemetrySensor,
     BshTideDiffSensor,
     BshTideLevelSensor,    
     BshTideEventTimeSensor,
@@ -17,15 +27,19 @@ from custom_components.bsh_tides.sensor import (
 
 @pytest.fixture
 def dummy_hwnw_forecast():
+    next_high = datetime.now(UTC) + timedelta(hours=1)
+    next_low = datetime.now(UTC) + timedelta(hours=8)
     return [
         {
-            "timestamp": (datetime.now(UTC) + timedelta(hours=1)).isoformat(),
+            "timestamp": next_high.isoformat(),
+            "time": next_high,
             "value": 165.3,
             "forecast": 30,
             "event": "HW",
         },
         {
-            "timestamp": (datetime.now(UTC) + timedelta(hours=8)).isoformat(),
+            "timestamp": next_low.isoformat(),
+            "time": next_low,
             "value": 13,
             "forecast": 0,
             "event": "NW",
@@ -70,7 +84,32 @@ def dummy_coordinator(dummy_hwnw_forecast, dummy_curve_forecast):
                     "data": dummy_curve_forecast
                 },
             }
-            self.forecast_data = dummy_hwnw_forecast
+            # the raw API items, converted on every read so tests can modify them
+            self.raw_forecast = dummy_hwnw_forecast
+            self.forecast_created = datetime.fromisoformat(self.data["creation_forecast"])
+            self.forecast_type = "peak_value_forecast"
+            self.full_refreshes = 3
+            self.skipped_refreshes = 5
+            self.suppressed_writes = 7
+            self.last_update_success = True
+            self.telemetry = StationTelemetry()
+
+        @property
+        def forecast_data(self):
+            return [
+                ForecastEvent.create(
+                    item["time"], item["event"], item["value"], item["forecast"], item.get("predicted", False)
+                )
+                for item in self.raw_forecast
+            ]
+
+        @property
+        def next_events(self):
+            return ForecastIndex(self.forecast_data).snapshot(datetime.now(UTC))
+
+        @property
+        def level_model(self):
+            return TideLevelModel.from_events(self.forecast_data)
     return DummyCoordinator()
 
 # --- Tests: BshNextTideTimeSensor --- #
@@ -81,6 +120,20 @@ def test_next_tide_time_sensor_value(dummy_coordinator):
     assert isinstance(value, datetime)
     assert value > datetime.now(UTC)
 
+def test_next_tide_sensors_mark_predicted_tides(dummy_coordinator):
+    assert BshTideLevelSensor(dummy_coordinator).extra_state_attributes == {"predicted": False}
+    dummy_coordinator.raw_forecast[0]["predicted"] = True
+    for sensor in (
+        BshTideEventTimeSensor(dummy_coordinator),
+        BshTideLevelSensor(dummy_coordinator, TideEvent.HIGH),
+        BshTideDiffSensor(dummy_coordinator),
+        BshNextTideEventSensor(dummy_coordinator),
+    ):
+        assert sensor.extra_state_attributes == {"predicted": True}
+    assert BshTideLevelSensor(dummy_coordinator, TideEvent.LOW).extra_state_attributes == {"predicted": False}
+    dummy_coordinator.raw_forecast.clear()
+    assert BshTideLevelSensor(dummy_coordinator).extra_state_attributes is None
+
 def test_next_tide_time_sensor_meta(dummy_coordinator):
     sensor = BshTideEventTimeSensor(dummy_coordinator)
     assert sensor.unique_id == "bsh_dummy_station_next_tide_time"
@@ -100,7 +153,7 @@ def test_next_tide_level_sensor_meta(dummy_coordinator):
     assert sensor.translation_key == "next_tide_level"
 
 def test_next_tide_level_sensor_invalid_value(dummy_coordinator):
-    dummy_coordinator.forecast_data[0]["value"] = ""
+    dummy_coordinator.raw_forecast[0]["value"] = ""
     sensor = BshTideLevelSensor(dummy_coordinator)
     assert sensor.native_value is None
 
@@ -119,12 +172,12 @@ def test_next_low_tide_level_sensor_meta(dummy_coordinator):
     assert sensor.translation_key == "next_low_tide_level"
 
 def test_next_low_tide_level_sensor_invalid_value(dummy_coordinator):   
-    dummy_coordinator.forecast_data[1]["value"] = "lala"
+    dummy_coordinator.raw_forecast[1]["value"] = "lala"
     sensor = BshTideLevelSensor(dummy_coordinator, TideEvent.LOW)
     assert sensor.native_value is None
 
 def test_next_low_tide_level_sensor_invalid_event(dummy_coordinator):
-    dummy_coordinator.forecast_data[1]["event"] = "HW"
+    dummy_coordinator.raw_forecast[1]["event"] = "HW"
     sensor = BshTideLevelSensor(dummy_coordinator, TideEvent.LOW)
     assert sensor.native_value is None
 
@@ -143,15 +196,61 @@ def test_next_high_tide_level_sensor_meta(dummy_coordinator):
     assert sensor.translation_key == "next_high_tide_level"
 
 def test_next_high_tide_level_sensor_invalid_value(dummy_coordinator):   
-    dummy_coordinator.forecast_data[0]["value"] = "lala"
+    dummy_coordinator.raw_forecast[0]["value"] = "lala"
     sensor = BshTideLevelSensor(dummy_coordinator, TideEvent.HIGH)
     assert sensor.native_value is None
 
 def test_next_high_tide_level_sensor_invalid_event(dummy_coordinator):
-    dummy_coordinator.forecast_data[0]["event"] = "NW"
+    dummy_coordinator.raw_forecast[0]["event"] = "NW"
     sensor = BshTideLevelSensor(dummy_coordinator, TideEvent.HIGH)
     assert sensor.native_value is None
 
+# --- Tests: BshCurrentTideLevelSensor --- #
+
+def test_current_tide_level_sensor_value(dummy_coordinator):
+    # the previous low tide was 5 hours ago, the next high tide is in 1 hour
+    dummy_coordinator.raw_forecast.insert(0, {
+        "time": datetime.now(UTC) - timedelta(hours=5),
+        "value": 13,
+        "forecast": 0,
+        "event": "NW",
+    })
+    sensor = BshCurrentTideLevelSensor(dummy_coordinator)
+    value = sensor.native_value
+    assert isinstance(value, int)
+    assert 13 < value < 165
+
+def test_current_tide_level_sensor_outside_forecast(dummy_coordinator):
+    sensor = BshCurrentTideLevelSensor(dummy_coordinator)
+    assert sensor.native_value is None
+
+def test_forecast_sensors_stay_available_when_refresh_fails(dummy_coordinator):
+    dummy_coordinator.last_update_success = False
+    dummy_coordinator.raw_forecast.insert(0, {
+        "time": datetime.now(UTC) - timedelta(hours=5),
+        "value": 13,
+        "forecast": 0,
+        "event": "NW",
+    })
+    sensors = (
+        BshTideEventTimeSensor(dummy_coordinator),
+        BshTideLevelSensor(dummy_coordinator, TideEvent.HIGH),
+        BshTideDiffSensor(dummy_coordinator),
+        BshNextTideEventSensor(dummy_coordinator),
+        BshCurrentTideLevelSensor(dummy_coordinator),
+    )
+    assert all(sensor.available for sensor in sensors)
+    assert not BshMeanWaterLevelSensor(dummy_coordinator, TideEvent.HIGH).available
+
+    # once the forecast has run out they are unavailable as well
+    dummy_coordinator.raw_forecast.clear()
+    assert not any(sensor.available for sensor in sensors)
+
+def test_current_tide_level_sensor_meta(dummy_coordinator):
+    sensor = BshCurrentTideLevelSensor(dummy_coordinator)
+    assert sensor.unique_id == "bsh_dummy_station_current_tide_level"
+    assert sensor.translation_key == "current_tide_level"
+
 # --- Tests: BshTideDiffSensor --- #
 
 def test_next_tide_diff_sensor_value(dummy_coordinator):
@@ -167,7 +266,7 @@ def test_low_tide_diff_sensor_value(dummy_coordinator):
     assert value == 0
 
 def test_tide_diff_sensor_invalid_forecast(dummy_coordinator):
-    dummy_coordinator.forecast_data[0]["forecast"] = "not a number"
+    dummy_coordinator.raw_forecast[0]["forecast"] = "not a number"
     sensor = BshTideDiffSensor(dummy_coordinator, TideEvent.HIGH)
     assert sensor.native_value is None
 
@@ -208,6 +307,20 @@ def test_forecast_created_sensor_value(dummy_coordinator):
     assert isinstance(value, datetime)
     assert value < datetime.now(UTC) + timedelta(minutes=1)
 
+def test_forecast_created_sensor_has_no_counters(dummy_coordinator):
+    # the counters change on every refresh, they would force a write of this sensor
+    assert BshForecastCreatedSensor(dummy_coordinator).extra_state_attributes is None
+
+def test_refreshes_sensor(dummy_coordinator):
+    sensor = BshRefreshesSensor(dummy_coordinator)
+    assert sensor.unique_id == "bsh_dummy_station_full_refreshes"
+    assert sensor.native_value == 3
+    assert sensor.extra_state_attributes == {
+        "skipped_refreshes": 5,
+        "suppressed_writes": 7,
+    }
+    assert sensor.entity_registry_enabled_default is False
+
 # --- Tests: BshStationAreaSensor --- #
 
 def test_station_area_sensor_keys(dummy_coordinator):
@@ -229,7 +342,7 @@ def test_next_tide_event_sensor_value(dummy_coordinator):
 
 def test_next_tide_event_sensor_value_low(dummy_coordinator):
     sensor = BshNextTideEventSensor(dummy_coordinator)
-    dummy_coordinator.forecast_data[0]["event"] = "NW"
+    dummy_coordinator.raw_forecast[0]["event"] = "NW"
     assert sensor.native_value == "low_tide"    
 
 def test_next_tide_event_sensor_unique_id(dummy_coordinator):
@@ -250,9 +363,75 @@ def test_forecast_type_sensor_value_peak(dummy_coordinator):
     assert value == "peak_value_forecast"
 
 def test_forecast_type_sensor_value_curve(dummy_coordinator):
-    # remove the hwnw_forecast to make it use curve_forecast
-    del dummy_coordinator.data["hwnw_forecast"]
+    # a station without hwnw_forecast uses the curve_forecast
+    dummy_coordinator.forecast_type = "curve_forecast"
     sensor = BshForecastTypeSensor(dummy_coordinator)
     value = sensor.native_value
     assert isinstance(value, str)
-    assert value == "curve_forecast"
\ No newline at end of file
+    assert value == "curve_forecast"
+
+# --- Tests: telemetry sensors --- #
+
+def test_telemetry_sensor_value(dummy_coordinator):
+    for value in (120.04, 80, 100):
+        dummy_coordinator.telemetry.fetch_latency.add(value)
+    sensor = BshTelemetrySensor(dummy_coordinator, "fetch_latency")
+    assert sensor.unique_id == "bsh_dummy_station_fetch_latency"
+    assert sensor.native_value == 100
+    assert sensor.extra_state_attributes == {"p50": 100, "p90": 120.0, "p99": 120.0, "samples": 3}
+    assert sensor.entity_registry_enabled_default is False
+
+def test_telemetry_sensor_without_samples(dummy_coordinator):
+    sensor = BshTelemetrySensor(dummy_coordinator, "payload_size")
+    assert sensor.native_value is None
+    assert sensor.native_unit_of_measurement == "B"
+
+def test_failure_sensors(dummy_coordinator):
+    now = datetime.now(UTC)
+    dummy_coordinator.telemetry.record_success(now)
+    dummy_coordinator.telemetry.record_failure()
+    assert BshConsecutiveFailuresSensor(dummy_coordinator).native_value == 1
+    assert BshLastSuccessSensor(dummy_coordinator).native_value == now
+
+# --- Tests: change detection --- #
+
+def test_unchanged_state_is_not_written(monkeypatch, dummy_coordinator):
+    write = MagicMock()
+    monkeypatch.setattr(Entity, "async_write_ha_state", write)
+    sensor = BshMeanWaterLevelSensor(dummy_coordinator, TideEvent.HIGH)
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    assert write.call_count == 1
+    assert dummy_coordinator.suppressed_writes == 9
+
+    dummy_coordinator.data["MHW"] = 181
+    sensor._handle_coordinator_update()
+    assert write.call_count == 2
+    dummy_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    assert write.call_count == 3
+
+def test_changed_attributes_are_written(monkeypatch, dummy_coordinator):
+    write = MagicMock()
+    monkeypatch.setattr(Entity, "async_write_ha_state", write)
+    sensor = BshTelemetrySensor(dummy_coordinator, "fetch_latency")
+    dummy_coordinator.telemetry.fetch_latency.add(100)
+    sensor._handle_coordinator_update()
+    # same last value, but the percentiles change
+    dummy_coordinator.telemetry.fetch_latency.add(300)
+    dummy_coordinator.telemetry.fetch_latency.add(100)
+    sensor._handle_coordinator_update()
+    assert write.call_count == 2
+
+def test_level_ticks_are_not_counted(monkeypatch, dummy_coordinator):
+    write = MagicMock()
+    monkeypatch.setattr(Entity, "async_write_ha_state", write)
+    sensor = BshCurrentTideLevelSensor(dummy_coordinator)
+    sensor._handle_coordinator_update()
+    sensor._async_update_level(datetime.now(UTC))
+    sensor._async_update_level(datetime.now(UTC))
+    assert write.call_count == 1
+    assert dummy_coordinator.suppressed_writes == 7
+    sensor._handle_coordinator_update()
+    assert dummy_coordinator.suppressed_writes == 8
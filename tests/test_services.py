@@ -0,0 +1,79 @@
+import pytest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.bsh_tides.const import DOMAIN
+from custom_components.bsh_tides.forecast import ForecastEvent, ForecastIndex
+from custom_components.bsh_tides.services import GET_TIDES_SCHEMA, _async_get_tides
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+def _coordinator(bshnr: str, hours: range) -> MagicMock:
+    coordinator = MagicMock()
+    coordinator.bshnr = bshnr
+    coordinator.station_name = f"Station {bshnr}"
+    coordinator.index = ForecastIndex([
+        ForecastEvent.create(NOW + timedelta(hours=hour), "HW" if hour % 12 else "NW", 100 + hour, 0)
+        for hour in hours
+    ])
+    return coordinator
+
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    # two entries of the same station share a coordinator
+    first = _coordinator("A", range(-12, 48, 6))
+    hass.data = {DOMAIN: {"entry_1": first, "entry_2": first, "entry_3": _coordinator("B", range(1, 25, 6))}}
+    return hass
+
+
+async def get_tides(hass, **data):
+    return await _async_get_tides(hass, MagicMock(data=GET_TIDES_SCHEMA(data)))
+
+
+@pytest.mark.asyncio
+async def test_get_tides_of_all_stations(hass):
+    response = await get_tides(hass)
+    stations = response["stations"]
+    assert list(stations) == ["A", "B"]
+    # upcoming tides only
+    assert stations["A"]["events"][0]["time"] == (NOW + timedelta(hours=6)).isoformat()
+    assert len(stations["A"]["events"]) == 7
+    assert stations["B"]["name"] == "Station B"
+    assert stations["B"]["next_start"] is None
+
+@pytest.mark.asyncio
+async def test_get_tides_window_and_filter(hass):
+    response = await get_tides(hass, station="A", duration={"hours": 24}, event="NW")
+    events = response["stations"]["A"]["events"]
+    assert [item["event"] for item in events] == ["NW", "NW"]
+    assert list(response["stations"]) == ["A"]
+
+    response = await get_tides(
+        hass, station=["A", "B"], start=NOW + timedelta(hours=6), end=NOW + timedelta(hours=13)
+    )
+    assert [len(station["events"]) for station in response["stations"].values()] == [2, 1]
+
+@pytest.mark.asyncio
+async def test_get_tides_pages(hass):
+    response = await get_tides(hass, station="A", limit=3)
+    page = response["stations"]["A"]
+    assert len(page["events"]) == 3
+    assert page["next_start"] == (NOW + timedelta(hours=24)).isoformat()
+
+    response = await get_tides(hass, station="A", limit=3, start=page["next_start"])
+    assert response["stations"]["A"]["events"][0]["time"] == page["next_start"]
+
+@pytest.mark.asyncio
+async def test_get_tides_unknown_station(hass):
+    with pytest.raises(ServiceValidationError):
+        await get_tides(hass, station=["A", "C"])
+
+def test_get_tides_schema():
+    with pytest.raises(Exception):
+        GET_TIDES_SCHEMA({"end": "2025-07-13 06:00:00", "duration": {"hours": 1}})
+    with pytest.raises(Exception):
+        GET_TIDES_SCHEMA({"event": "XX"})
@@ -1,41 +1,121 @@
+import asyncio
 import pytest
-from homeassistant.config_entries import ConfigEntryNotReady
-from custom_components.bsh_tides.sensor import async_setup_entry
+from unittest.mock import AsyncMock, MagicMock
+from homeassistant.config_entries import ConfigEntryNotReady, current_entry
+from custom_components.bsh_tides import async_setup_entry
+from custom_components.bsh_tides import sensor
 from custom_components.bsh_tides.coordinator import BshTidesCoordinator
 from custom_components.bsh_tides.bsh_api import BshApi
-from custom_components.bsh_tides.const import DOMAIN
+from custom_components.bsh_tides.const import DATA_SCHEDULER, DOMAIN
+
+
+class DummyConfigEntry:
+    entry_id = "dummy_id"
+    data = {"bshnr": "123X"}  # fake ID
+    options = {}
+
+    def async_on_unload(self, func):
+        pass
 
-@pytest.mark.asyncio
-async def test_async_setup_entry_with_real_coordinator(monkeypatch):
-    """Test async_setup_entry raises ConfigEntryNotReady on real API error."""
 
-    # Dummy ConfigEntry with entry_id
-    class DummyConfigEntry:
-        entry_id = "dummy_id"
-        data = {"bshnr": "123X"}  # fake ID
+class DummyHass:
+    """Dummy hass with .data structure and task creation."""
 
-    # Dummy hass with .data structure
-    class DummyHass:
-        def __init__(self):
-            self.data = {DOMAIN: {}}
+    def __init__(self, tmp_path):
+        self.data = {DOMAIN: {}}
+        self.bus = MagicMock()
+        self.config = MagicMock(config_dir=str(tmp_path))
+        self.loop = asyncio.get_running_loop()
 
-    dummy_hass = DummyHass()
+    def async_create_task(self, target, name=None, eager_start=True):
+        return asyncio.create_task(target, name=name)
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_with_real_coordinator(monkeypatch, tmp_path):
+    """Test async_setup_entry raises ConfigEntryNotReady on real API error."""
+    dummy_hass = DummyHass(tmp_path)
 
     # Patch API call inside the coordinator
-    async def failing_fetch_data(self):
+    async def failing_fetch_data(self, conditional=False):
         raise Exception("Simulated fetch_data failure")
 
     monkeypatch.setattr(BshApi, "async_fetch_data", failing_fetch_data)
+    # Nothing cached, so the forecast has to be fetched
+    monkeypatch.setattr(BshTidesCoordinator, "async_restore", AsyncMock(return_value=False))
+    monkeypatch.setattr("custom_components.bsh_tides.async_get_session", MagicMock())
+
+    with pytest.raises(ConfigEntryNotReady) as exc:
+        await async_setup_entry(dummy_hass, DummyConfigEntry())
+
+    assert "Simulated fetch_data failure" in str(exc.value)
+    assert "dummy_id" not in dummy_hass.data[DOMAIN]
+
 
-    # Inject coordinator with failing fetch
-    coordinator = BshTidesCoordinator(dummy_hass, bshnr="123X")
+@pytest.mark.asyncio
+async def test_sensor_setup_does_not_refresh(tmp_path):
+    """Test that the sensor platform uses the forecast loaded by the integration."""
+    dummy_hass = DummyHass(tmp_path)
+    coordinator = MagicMock()
+    coordinator.async_refresh = AsyncMock()
+    coordinator.async_config_entry_first_refresh = AsyncMock()
+    coordinator.async_first_refresh = AsyncMock()
     dummy_hass.data[DOMAIN]["dummy_id"] = coordinator
+    entities = []
 
-    # Dummy entity registration
-    async def dummy_add_entities(entities):
-        pass
+    await sensor.async_setup_entry(dummy_hass, DummyConfigEntry(), entities.extend)
 
-    with pytest.raises(ConfigEntryNotReady) as exc:
-        await async_setup_entry(dummy_hass, DummyConfigEntry(), dummy_add_entities)
+    assert entities
+    coordinator.async_refresh.assert_not_called()
+    coordinator.async_config_entry_first_refresh.assert_not_called()
+    coordinator.async_first_refresh.assert_not_called()
 
-    assert "Simulated fetch_data failure" in str(exc.value)
+
+class UnloadableConfigEntry(DummyConfigEntry):
+    """Config entry that keeps its unload callbacks."""
+
+    def __init__(self, entry_id):
+        self.entry_id = entry_id
+        self.title = entry_id
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return MagicMock()
+
+    async def async_unload(self):
+        for func in self._on_unload:
+            if asyncio.iscoroutine(result := func()):
+                await result
+
+
+@pytest.mark.asyncio
+async def test_unloading_one_of_two_entries_keeps_station_scheduled(monkeypatch, tmp_path):
+    """Test that the shared coordinator outlives all but the last entry of its station."""
+    dummy_hass = DummyHass(tmp_path)
+    dummy_hass.config_entries = MagicMock(async_forward_entry_setups=AsyncMock())
+    monkeypatch.setattr(BshTidesCoordinator, "async_first_refresh", AsyncMock())
+    monkeypatch.setattr("custom_components.bsh_tides.async_get_session", MagicMock())
+    first, second = UnloadableConfigEntry("first"), UnloadableConfigEntry("second")
+
+    for entry in (first, second):
+        # Home Assistant sets up every entry with it as the current entry
+        token = current_entry.set(entry)
+        try:
+            await async_setup_entry(dummy_hass, entry)
+        finally:
+            current_entry.reset(token)
+    coordinator = dummy_hass.data[DOMAIN]["first"]
+    scheduler = dummy_hass.data[DATA_SCHEDULER]
+    assert dummy_hass.data[DOMAIN]["second"] is coordinator
+    assert coordinator.config_entry is None
+
+    await first.async_unload()
+    assert scheduler._coordinators["123X"] is coordinator
+    assert "123X" in scheduler._unsub_refresh
+
+    await second.async_unload()
+    assert "123X" not in scheduler._coordinators
+    assert "123X" not in scheduler._unsub_refresh
@@ -0,0 +1,70 @@
+import pytest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+from custom_components.bsh_tides import statistics as statistics_module
+from custom_components.bsh_tides.interpolation import TideLevelModel
+from custom_components.bsh_tides.statistics import (
+    ForecastStatistics,
+    hourly_levels,
+    statistic_id,
+)
+
+START = datetime(2025, 7, 13, 5, 50, tzinfo=UTC)
+
+
+def curve_model(hours: int, offset: float = 0) -> TideLevelModel:
+    """A rising curve forecast, 1 cm per 10 minutes."""
+    return TideLevelModel(
+        ((START + timedelta(minutes=10 * i)).timestamp(), 100 + i + offset)
+        for i in range(hours * 6 + 1)
+    )
+
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    hass.config.components = {"recorder"}
+    return hass
+
+
+def test_statistic_id():
+    assert statistic_id("DE__508P") == "bsh_tides:forecast_level_de_508p"
+
+
+def test_hourly_levels_full_hours_only():
+    rows = hourly_levels(curve_model(3))
+    # 05:50 - 08:50: only 06:00 - 07:00 and 07:00 - 08:00 are complete
+    assert list(rows) == [START + timedelta(minutes=10), START + timedelta(minutes=70)]
+    assert rows[START + timedelta(minutes=10)] == (103.5, 101, 106)
+    assert hourly_levels(TideLevelModel([])) == {}
+
+
+def test_push_changed_rows_only(monkeypatch, hass):
+    add = MagicMock()
+    monkeypatch.setattr(statistics_module, "async_add_external_statistics", add)
+    statistics = ForecastStatistics(hass, "DE__508P")
+
+    assert statistics.async_push(curve_model(4), "Dummy Station") == 3
+    add.assert_called_once()
+    metadata, rows = add.call_args.args[1:]
+    assert metadata["statistic_id"] == "bsh_tides:forecast_level_de_508p"
+    assert metadata["source"] == "bsh_tides"
+    assert metadata["unit_of_measurement"] == "cm"
+    assert [row["start"].hour for row in rows] == [6, 7, 8]
+
+    # the same forecast again is not sent
+    assert statistics.async_push(curve_model(4), "Dummy Station") == 0
+    add.assert_called_once()
+
+    # one more hour, the others did not change
+    assert statistics.async_push(curve_model(5), "Dummy Station") == 1
+    assert [row["start"].hour for row in add.call_args.args[2]] == [9]
+
+
+def test_push_without_recorder(monkeypatch, hass):
+    add = MagicMock()
+    monkeypatch.setattr(statistics_module, "async_add_external_statistics", add)
+    hass.config.components = set()
+    assert ForecastStatistics(hass, "DE__508P").async_push(curve_model(4), "Dummy") == 0
+    add.assert_not_called()
@@ -0,0 +1,33 @@
+from datetime import UTC, datetime
+
+from custom_components.bsh_tides.telemetry import RollingStats, StationTelemetry
+
+
+def test_rolling_stats_percentiles():
+    stats = RollingStats()
+    assert stats.last is None
+    assert stats.summary() == {"p50": None, "p90": None, "p99": None, "samples": 0}
+    for value in range(100, 0, -2):
+        stats.add(value)
+    assert stats.last == 2
+    assert stats.percentile(50) == 50
+    assert stats.percentile(90) == 90
+    assert stats.percentile(100) == 100
+    assert stats.percentile(0) == 2
+
+def test_rolling_stats_window():
+    stats = RollingStats(size=3)
+    for value in (1000, 1, 2, 3):
+        stats.add(value)
+    assert len(stats) == 3
+    assert stats.summary() == {"p50": 2, "p90": 3, "p99": 3, "samples": 3}
+
+def test_failures_reset_on_success():
+    telemetry = StationTelemetry()
+    telemetry.record_failure()
+    telemetry.record_failure()
+    assert telemetry.consecutive_failures == 2
+    now = datetime.now(UTC)
+    telemetry.record_success(now)
+    assert telemetry.consecutive_failures == 0
+    assert telemetry.last_success == now